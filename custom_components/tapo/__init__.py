@@ -1,30 +1,103 @@
 from __future__ import annotations
 
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 
-from .api import TapoAPI
-from .const import DOMAIN
+from .api import TapoAPI, TapoTimeoutError
+from .const import (
+    CONF_DEVICE_PROFILES,
+    CONF_HEDGE_DELAY,
+    CONF_OFFLOAD_PARSING,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SLOW_STEP_THRESHOLD,
+    DATA_VALIDATED_SESSIONS,
+    DEFAULT_HEDGE_DELAY,
+    DEFAULT_SLOW_STEP_THRESHOLD,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    VALIDATED_SESSION_TTL,
+)
+from .dial import TapoDialManager, get_dial_bindings_store
+from .profiles import async_apply_device_profiles
+from .sensor import get_battery_drain_store
+from .services import async_setup_services, async_unload_services
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
 
+@callback
+def async_store_validated_api(hass: HomeAssistant, api: TapoAPI) -> None:
+    """Keep a freshly validated API for a short time so setup can reuse its session."""
+    sessions = hass.data.setdefault(DATA_VALIDATED_SESSIONS, {})
+    key = (api.host, api.username, api.password)
+
+    if (previous := sessions.pop(key, None)) is not None:
+        previous[1].cancel()
+        hass.async_create_task(previous[0].async_close())
+
+    @callback
+    def _expire() -> None:
+        if (stored := sessions.pop(key, None)) is not None:
+            hass.async_create_task(stored[0].async_close())
+
+    sessions[key] = (api, hass.loop.call_later(VALIDATED_SESSION_TTL, _expire))
+
+
+@callback
+def async_pop_validated_api(hass: HomeAssistant, entry: ConfigEntry) -> TapoAPI | None:
+    sessions = hass.data.get(DATA_VALIDATED_SESSIONS, {})
+    key = (entry.data[CONF_HOST], entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD])
+    if (stored := sessions.pop(key, None)) is None:
+        return None
+    api, expire_handle = stored
+    expire_handle.cancel()
+    return api
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     
-    api = TapoAPI(
-        entry.data[CONF_USERNAME],
-        entry.data[CONF_PASSWORD],
-        entry.data[CONF_HOST],
+    api = async_pop_validated_api(hass, entry)
+    if api is None:
+        api = TapoAPI(
+            entry.data[CONF_USERNAME],
+            entry.data[CONF_PASSWORD],
+            entry.data[CONF_HOST],
+        )
+    api.timeout = entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_TIMEOUT)
+    api.hedge_delay = entry.options.get(CONF_HEDGE_DELAY, DEFAULT_HEDGE_DELAY)
+    api.offload_parsing = entry.options.get(CONF_OFFLOAD_PARSING, False)
+    api.loop_monitor.slow_step_threshold = entry.options.get(
+        CONF_SLOW_STEP_THRESHOLD, DEFAULT_SLOW_STEP_THRESHOLD
     )
     
-    await api.async_authenticate()
+    try:
+        await api.async_authenticate()
+    except TapoTimeoutError as err:
+        raise ConfigEntryNotReady(f"Timed out connecting to hub {entry.data[CONF_HOST]}") from err
     
-    hass.data[DOMAIN][entry.entry_id] = {"api": api}
+    hass.data[DOMAIN][entry.entry_id] = {
+        "api": api,
+        "reload_settings": _get_reload_settings(entry),
+    }
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    if (event_poller := entry_data.get("event_poller")) is not None:
+        dial_manager = TapoDialManager(hass, api, entry.entry_id, event_poller.device_ids)
+        await dial_manager.async_load()
+        entry_data["dial_manager"] = dial_manager
+        entry.async_on_unload(dial_manager.async_stop)
+    
+    async_setup_services(hass)
+    
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    
     return True
 
 
@@ -34,10 +107,26 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry_data = hass.data[DOMAIN].pop(entry.entry_id)
         if "api" in entry_data:
             await entry_data["api"].async_close()
+        async_unload_services(hass)
     
     return unload_ok
 
 
+def _get_reload_settings(entry: ConfigEntry) -> dict[str, Any]:
+    """Entry settings that can only be applied by reloading the entry."""
+    options = {key: value for key, value in entry.options.items() if key != CONF_DEVICE_PROFILES}
+    return {"data": dict(entry.data), "options": options}
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await get_battery_drain_store(hass, entry.entry_id).async_remove()
+    await get_dial_bindings_store(hass, entry.entry_id).async_remove()
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is not None and entry_data["reload_settings"] == _get_reload_settings(entry):
+        # Only device polling profiles changed; apply them without reloading.
+        async_apply_device_profiles(entry, entry_data)
+        return
     await hass.config_entries.async_reload(entry.entry_id)
-
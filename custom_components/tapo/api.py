@@ -1,13 +1,101 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
 import logging
 from datetime import datetime
-from typing import Any
+from typing import Any, TypeVar
 
 from tapo import ApiClient
 
+from .const import DEFAULT_HEDGE_DELAY, DEFAULT_TIMEOUT
+from .cassette import CassetteRecorder, RecordingHub, TapoReplayHub, load_cassette
+from .events import DEFAULT_QUEUE_SIZE, OVERFLOW_DROP_OLDEST, TapoEventStream, TapoEventSubscription
+from .loop_monitor import LoopMonitor, instrumented
+
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+MAX_BATCH_FAILURES = 3
+
+
+RECOVERY_RETRY = "retry"
+RECOVERY_HANDLER = "rebuild_handler"
+RECOVERY_SESSION = "refresh_session"
+RECOVERY_LOGIN = "login"
+RECOVERY_STEPS = (RECOVERY_RETRY, RECOVERY_HANDLER, RECOVERY_SESSION, RECOVERY_LOGIN)
+
+
+class TapoError(Exception):
+    """Base class for errors raised while talking to the hub."""
+
+
+class TapoTimeoutError(TapoError, asyncio.TimeoutError):
+    """Raised when a hub request exceeds its deadline."""
+
+
+class TapoConnectionError(TapoError):
+    """The connection to the hub was reset, refused or closed."""
+
+
+class TapoSessionError(TapoError):
+    """The hub session expired or was rejected; a new handshake is needed."""
+
+
+class TapoDeviceError(TapoError):
+    """The child device is unknown to the hub or its handler is stale."""
+
+
+_SESSION_ERROR_MARKERS = ("SessionTimeout", "Unauthorized", "InvalidCredentials", "InvalidPublicKey")
+_CONNECTION_ERROR_MARKERS = (
+    "Connection reset",
+    "Connection refused",
+    "Connection closed",
+    "connection closed",
+    "Broken pipe",
+    "broken pipe",
+    "os error",
+)
+
+
+def classify_error(err: BaseException) -> TapoError:
+    """Map an exception raised by the tapo library to a typed error.
+
+    The library raises plain exceptions carrying the Rust error variant in the
+    message (e.g. ``Tapo(SessionTimeout)``, ``Http(reqwest::Error ...)``), so the
+    mapping has to look at the message and type name.
+    """
+    if isinstance(err, TapoError):
+        return err
+    if isinstance(err, asyncio.TimeoutError):
+        error: TapoError = TapoTimeoutError(str(err))
+    else:
+        message = str(err)
+        if any(marker in message for marker in _SESSION_ERROR_MARKERS):
+            error = TapoSessionError(message)
+        elif "DeviceNotFound" in message:
+            error = TapoDeviceError(message)
+        elif (
+            isinstance(err, (ConnectionError, OSError))
+            or "Http" in type(err).__name__
+            or message.startswith("Http")
+            or any(marker in message for marker in _CONNECTION_ERROR_MARKERS)
+        ):
+            error = TapoConnectionError(message)
+        else:
+            error = TapoError(message)
+    error.__cause__ = err
+    return error
+
+
+# The recovery ladder starts at the cheapest step that can fix each error class.
+_RECOVERY_START: dict[type[TapoError], str] = {
+    TapoConnectionError: RECOVERY_RETRY,
+    TapoDeviceError: RECOVERY_HANDLER,
+    TapoSessionError: RECOVERY_SESSION,
+}
+
 
 class TapoAPI:
     def __init__(
@@ -15,25 +103,192 @@ class TapoAPI:
         username: str,
         password: str,
         host: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        hedge_delay: float | None = DEFAULT_HEDGE_DELAY,
+        offload_parsing: bool = False,
+        replay_hub: TapoReplayHub | None = None,
     ) -> None:
         self.username = username
         self.password = password
         self.host = host
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.offload_parsing = offload_parsing
+        self.loop_monitor = LoopMonitor()
+        self.replay_hub = replay_hub
+        self._recorder: CassetteRecorder | None = None
         self._client: ApiClient | None = None
         self._hub: Any | None = None
         self._device: Any | None = None
         self._s200_handler: Any | None = None
+        self._s200_handlers: dict[str, Any] = {}
+        self._batch_failures = 0
+        self._in_flight: dict[str, asyncio.Future[Any]] = {}
+        self._recent_results: dict[str, tuple[float, Any]] = {}
+        self._coalesce_generation = 0
         self._device_id: str | None = None
         self._authenticated = False
         self._last_successful_auth_time: datetime | None = None
+        self._validated_hub: Any | None = None
+        self._timeout_count = 0
+        self._hedged_request_count = 0
+        self.events = TapoEventStream()
+        self._recovery_counts: dict[str, int] = dict.fromkeys(RECOVERY_STEPS, 0)
 
-    async def async_authenticate(self) -> bool:
+    async def _async_call(
+        self, operation: str, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a single hub request under the configured deadline."""
         try:
+            return await asyncio.wait_for(request(), self.timeout)
+        except asyncio.TimeoutError as err:
+            self._timeout_count += 1
+            raise TapoTimeoutError(
+                f"{operation} timed out after {self.timeout}s (host: {self.host})"
+            ) from err
+
+    async def _async_hedged_call(
+        self, operation: str, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a hub request, sending a second copy if the first one is slow.
+
+        Whichever copy answers first wins; the whole operation is still bounded by
+        the configured deadline.
+        """
+        if not self.hedge_delay or self.hedge_delay >= self.timeout:
+            return await self._async_call(operation, request)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        pending: set[asyncio.Future[_T]] = {asyncio.ensure_future(request())}
+        hedged = False
+        last_error: BaseException | None = None
+
+        try:
+            while pending:
+                wait_for = deadline - loop.time()
+                if not hedged:
+                    wait_for = min(wait_for, self.hedge_delay)
+                if wait_for <= 0:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    last_error = future.exception()
+
+                if not done and not hedged:
+                    hedged = True
+                    self._hedged_request_count += 1
+                    _LOGGER.debug(
+                        "%s slower than %.2fs, sending hedged request", operation, self.hedge_delay
+                    )
+                    pending.add(asyncio.ensure_future(request()))
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if last_error is not None and not pending:
+            raise last_error
+
+        self._timeout_count += 1
+        raise TapoTimeoutError(
+            f"{operation} timed out after {self.timeout}s (host: {self.host})"
+        )
+
+    async def _async_coalesced(
+        self, key: str, request: Callable[[], Awaitable[_T]], max_age: float = 0.0
+    ) -> _T:
+        """Share one in-flight request between concurrent identical callers.
+
+        A completed result is also reused when it is at most max_age seconds old.
+        Failures are never cached.
+        """
+        loop = asyncio.get_running_loop()
+        if max_age > 0 and (recent := self._recent_results.get(key)) is not None:
+            completed_at, result = recent
+            if loop.time() - completed_at <= max_age:
+                return result
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(request())
+            self._in_flight[key] = future
+            generation = self._coalesce_generation
+
+            def _done(done: asyncio.Future[Any]) -> None:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+                # A result fetched before an invalidation must not be cached as fresh.
+                if generation != self._coalesce_generation:
+                    return
+                if not done.cancelled() and done.exception() is None:
+                    self._recent_results[key] = (loop.time(), done.result())
+
+            future.add_done_callback(_done)
+        else:
+            _LOGGER.debug("Joining in-flight %s request", key)
+
+        return await asyncio.shield(future)
+
+    def _invalidate_coalesced(self) -> None:
+        self._coalesce_generation += 1
+        self._in_flight = {}
+        self._recent_results = {}
+
+    async def _async_get_child_device_list(self, max_age: float = 0.0) -> Any:
+        hub = self._hub
+        return await self._async_coalesced(
+            "child_device_list",
+            lambda: self._async_call("Child device list", hub.get_child_device_list),
+            max_age,
+        )
+
+    async def _async_login(self) -> Any:
+        if self.replay_hub is not None:
+            hub: Any = self.replay_hub
+        else:
             self._client = ApiClient(self.username, self.password)
-            hub = await self._client.h100(self.host)
-            _LOGGER.debug("Hub connected successfully at %s", self.host)
+            client = self._client
+            hub = await self._async_call("Hub login", lambda: client.h100(self.host))
+        if self._recorder is not None:
+            hub = RecordingHub(hub, self._recorder)
+        return hub
+
+    @instrumented
+    async def async_validate_credentials(self) -> bool:
+        """Perform only the hub handshake.
+
+        The resulting session is kept and reused by the next async_authenticate call,
+        so a validated API can be handed over to setup without logging in twice.
+        """
+        try:
+            self._validated_hub = await self._async_login()
+            _LOGGER.debug("Credentials validated against hub at %s", self.host)
+            return True
+        except TapoTimeoutError:
+            self._validated_hub = None
+            raise
+        except Exception as err:
+            _LOGGER.error("Credential validation failed: %s", err)
+            self._validated_hub = None
+            return False
+
+    @instrumented
+    async def async_authenticate(self) -> bool:
+        try:
+            if self._validated_hub is not None:
+                hub = self._validated_hub
+                self._validated_hub = None
+                _LOGGER.debug("Reusing validated hub session at %s", self.host)
+            else:
+                hub = await self._async_login()
+                _LOGGER.debug("Hub connected successfully at %s", self.host)
             
-            child_devices = await hub.get_child_device_list()
+            child_devices = await self._async_call("Child device list", hub.get_child_device_list)
             if not child_devices:
                 _LOGGER.warning("No child devices found on hub. S200B or S200D may need to be paired.")
                 return False
@@ -41,10 +296,17 @@ class TapoAPI:
             self._device = child_devices[0]
             self._device_id = self._device.device_id if hasattr(self._device, "device_id") else None
             self._hub = hub
+            self._s200_handlers = {}
+            self._invalidate_coalesced()
+            self._batch_failures = 0
             
             if self._device_id:
                 try:
-                    self._s200_handler = await hub.s200(self._device_id)
+                    device_id = self._device_id
+                    self._s200_handler = await self._async_call(
+                        "S200 handler", lambda: hub.s200(device_id)
+                    )
+                    self._s200_handlers[device_id] = self._s200_handler
                     _LOGGER.debug("S200B/S200D handler created for device %s", self._device_id)
                 except Exception as err:
                     _LOGGER.warning("Could not create S200B/S200D handler: %s", err)
@@ -53,11 +315,28 @@ class TapoAPI:
             self._last_successful_auth_time = datetime.now()
             _LOGGER.debug("Authentication successful, found %d child device(s)", len(child_devices))
             return True
+        except TapoTimeoutError as err:
+            _LOGGER.warning("Authentication timed out: %s", err)
+            self._authenticated = False
+            raise
         except Exception as err:
             _LOGGER.error("Authentication failed: %s", err)
             self._authenticated = False
             return False
 
+    async def _async_parse(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a parsing helper inline, or in the executor when offloading is enabled.
+
+        The helpers reflect over library objects whose property getters may be
+        costly, so on slow hosts they can be moved off the event loop.
+        """
+        if self.offload_parsing:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+        return func(*args)
+
+    def _extract_devices_data(self, devices: list[Any]) -> list[dict[str, Any]]:
+        return [self._extract_device_data(device) for device in devices]
+
     def _extract_device_data(self, device: Any) -> dict[str, Any]:
         result: dict[str, Any] = {}
         
@@ -99,7 +378,8 @@ class TapoAPI:
         
         return result
 
-    async def async_get_device_info(self) -> dict[str, Any] | None:
+    @instrumented
+    async def async_get_device_info(self, max_age: float = 0.0) -> dict[str, Any] | None:
         if not self._authenticated or not self._hub:
             _LOGGER.info("Not authenticated, authenticating...")
             if not await self.async_authenticate():
@@ -110,18 +390,21 @@ class TapoAPI:
             if not self._hub:
                 return None
             
-            child_devices = await self._hub.get_child_device_list()
+            child_devices = await self._async_get_child_device_list(max_age)
             if not child_devices:
                 return None
             
             current_device = child_devices[0]
-            return self._extract_device_data(current_device)
+            return await self._async_parse(self._extract_device_data, current_device)
+        except TapoTimeoutError:
+            raise
         except Exception as err:
             _LOGGER.error("Failed to get device info: %s", err, exc_info=True)
             self._authenticated = False
             return None
 
-    async def async_get_battery_status(self) -> dict[str, Any] | None:
+    @instrumented
+    async def async_get_battery_status(self, max_age: float = 0.0) -> dict[str, Any] | None:
         if not self._authenticated or not self._hub:
             _LOGGER.info("Not authenticated, authenticating...")
             if not await self.async_authenticate():
@@ -132,12 +415,12 @@ class TapoAPI:
             if not self._hub:
                 return None
             
-            child_devices = await self._hub.get_child_device_list()
+            child_devices = await self._async_get_child_device_list(max_age)
             if not child_devices:
                 return None
             
             current_device = child_devices[0]
-            device_data = self._extract_device_data(current_device)
+            device_data = await self._async_parse(self._extract_device_data, current_device)
             result: dict[str, Any] = {}
             
             if "battery_percentage" in device_data:
@@ -148,12 +431,15 @@ class TapoAPI:
                 result["at_low_battery"] = device_data["at_low_battery"]
             
             return result if result else None
+        except TapoTimeoutError:
+            raise
         except Exception as err:
             _LOGGER.error("Failed to get battery status: %s", err, exc_info=True)
             self._authenticated = False
             return None
 
-    async def async_get_all_child_devices(self) -> list[dict[str, Any]] | None:
+    @instrumented
+    async def async_get_all_child_devices(self, max_age: float = 0.0) -> list[dict[str, Any]] | None:
         """Get all child devices from the hub."""
         if not self._authenticated or not self._hub:
             _LOGGER.info("Not authenticated, authenticating...")
@@ -166,23 +452,28 @@ class TapoAPI:
                 _LOGGER.error("Hub not available")
                 return None
             
-            child_devices = await self._hub.get_child_device_list()
+            child_devices = await self._async_get_child_device_list(max_age)
             if not child_devices:
                 _LOGGER.warning("No child devices found")
                 return None
             
-            devices_data = []
-            for device in child_devices:
-                device_data = self._extract_device_data(device)
-                if device_data:
-                    devices_data.append(device_data)
+            devices_data = [
+                device_data
+                for device_data in await self._async_parse(self._extract_devices_data, child_devices)
+                if device_data
+            ]
             
             return devices_data if devices_data else None
+        except TapoTimeoutError:
+            raise
         except Exception as err:
             _LOGGER.error("Failed to get child devices: %s", err, exc_info=True)
             return None
 
-    async def async_get_sensor_data(self, device_id: str | None = None) -> dict[str, Any] | None:
+    @instrumented
+    async def async_get_sensor_data(
+        self, device_id: str | None = None, max_age: float = 0.0
+    ) -> dict[str, Any] | None:
         """Get sensor data for a specific device or the first device if device_id is None."""
         if not self._authenticated or not self._hub:
             _LOGGER.info("Not authenticated, authenticating...")
@@ -195,7 +486,7 @@ class TapoAPI:
                 _LOGGER.error("Hub not available")
                 return None
             
-            child_devices = await self._hub.get_child_device_list()
+            child_devices = await self._async_get_child_device_list(max_age)
             if not child_devices:
                 _LOGGER.warning("No child devices found")
                 return None
@@ -203,14 +494,16 @@ class TapoAPI:
             if device_id:
                 for device in child_devices:
                     if hasattr(device, "device_id") and device.device_id == device_id:
-                        device_data = self._extract_device_data(device)
+                        device_data = await self._async_parse(self._extract_device_data, device)
                         return device_data if device_data else None
                 _LOGGER.warning("Device %s not found", device_id)
                 return None
             else:
                 current_device = child_devices[0]
-                device_data = self._extract_device_data(current_device)
+                device_data = await self._async_parse(self._extract_device_data, current_device)
                 return device_data if device_data else None
+        except TapoTimeoutError:
+            raise
         except Exception as err:
             _LOGGER.error("Failed to get sensor data: %s", err, exc_info=True)
             return None
@@ -277,6 +570,136 @@ class TapoAPI:
         
         return result
     
+    def _parse_trigger_logs_many(self, responses: list[Any]) -> list[dict[str, Any] | None]:
+        return [self._parse_trigger_logs(response) for response in responses]
+
+    async def _async_get_s200_handler(self, hub: Any, device_id: str) -> Any:
+        """Return a cached S200 handler; creating one costs a child list round trip."""
+        handler = self._s200_handlers.get(device_id)
+        if handler is None:
+            handler = await hub.s200(device_id)
+            if hub is self._hub:
+                self._s200_handlers[device_id] = handler
+        return handler
+
+    async def _async_fetch_trigger_logs(
+        self, hub: Any, device_id: str, page_size: int, start_id: int
+    ) -> Any:
+        return await self._async_hedged_call(
+            "Trigger logs",
+            lambda: self._async_get_raw_trigger_logs(hub, device_id, page_size, start_id),
+        )
+
+    @instrumented
+    async def async_get_trigger_logs_batch(
+        self, device_ids: list[str], page_size: int = 10, start_id: int = 0
+    ) -> dict[str, dict[str, Any] | None]:
+        """Get trigger logs for several devices over the shared hub session.
+
+        The tapo library has no multi-request envelope, so every device still costs
+        its own request; they are sent concurrently, each one hedged and bounded by
+        the deadline. When every request fails the hub is recovered once and the
+        devices are retried, instead of walking the recovery ladder per device.
+        If concurrent requests keep failing where sequential ones succeed, requests
+        are sent one at a time until the next authentication.
+        """
+        if not device_ids:
+            return {}
+
+        if not self._authenticated:
+            _LOGGER.info("Not authenticated, authenticating...")
+            if not await self.async_authenticate():
+                _LOGGER.error("Authentication failed, cannot get trigger logs")
+                return dict.fromkeys(device_ids)
+
+        concurrent = len(device_ids) > 1 and self._batch_failures < MAX_BATCH_FAILURES
+        responses = await self._async_fetch_batch(device_ids, page_size, start_id, concurrent)
+        failed = [device_id for device_id, response in responses.items() if isinstance(response, Exception)]
+
+        if failed and len(failed) == len(device_ids):
+            errors = [classify_error(responses[device_id]) for device_id in failed]
+            if all(isinstance(error, TapoTimeoutError) for error in errors):
+                raise errors[0]
+            error = next(error for error in errors if not isinstance(error, TapoTimeoutError))
+            if type(error) not in _RECOVERY_START:
+                _LOGGER.error("Failed to get trigger logs on hub %s: %s", self.host, error)
+                return await self._async_collect_batch(responses)
+            _LOGGER.warning(
+                "%s while getting trigger logs of %d device(s) on hub %s: %s. Attempting recovery...",
+                type(error).__name__,
+                len(failed),
+                self.host,
+                error,
+            )
+            recovered, step = await self._async_recover_batch(failed, page_size, start_id, error)
+            responses.update(recovered)
+            if concurrent and step == RECOVERY_RETRY:
+                # Nothing was repaired, only the concurrency was taken away.
+                self._batch_failures += 1
+                _LOGGER.warning(
+                    "Concurrent trigger log requests failed where sequential ones succeeded (%d/%d)",
+                    self._batch_failures,
+                    MAX_BATCH_FAILURES,
+                )
+        elif failed:
+            for device_id in failed:
+                self._s200_handlers.pop(device_id, None)
+            responses.update(await self._async_fetch_batch(failed, page_size, start_id, False))
+        elif concurrent:
+            self._batch_failures = 0
+
+        return await self._async_collect_batch(responses)
+
+    async def _async_collect_batch(
+        self, responses: dict[str, Any]
+    ) -> dict[str, dict[str, Any] | None]:
+        results: dict[str, dict[str, Any] | None] = {}
+        succeeded = []
+        for device_id, response in responses.items():
+            if isinstance(response, Exception):
+                _LOGGER.warning("Failed to get trigger logs (device_id: %s): %s", device_id, response)
+                self._s200_handlers.pop(device_id, None)
+                results[device_id] = None
+            else:
+                succeeded.append(device_id)
+        parsed = await self._async_parse(
+            self._parse_trigger_logs_many, [responses[device_id] for device_id in succeeded]
+        )
+        results.update(zip(succeeded, parsed))
+        return results
+
+    async def _async_fetch_batch(
+        self, device_ids: list[str], page_size: int, start_id: int, concurrent: bool
+    ) -> dict[str, Any]:
+        """Fetch raw trigger logs per device; failed requests map to their exception."""
+        hub = self._hub
+        if concurrent:
+            responses = await asyncio.gather(
+                *(
+                    self._async_fetch_trigger_logs(hub, device_id, page_size, start_id)
+                    for device_id in device_ids
+                ),
+                return_exceptions=True,
+            )
+            return dict(zip(device_ids, responses))
+
+        results: dict[str, Any] = {}
+        for device_id in device_ids:
+            try:
+                results[device_id] = await self._async_fetch_trigger_logs(
+                    hub, device_id, page_size, start_id
+                )
+            except Exception as err:
+                results[device_id] = err
+        return results
+
+    async def _async_get_raw_trigger_logs(
+        self, hub: Any, device_id: str, page_size: int, start_id: int
+    ) -> Any:
+        s200_handler = await self._async_get_s200_handler(hub, device_id)
+        return await s200_handler.get_trigger_logs(page_size=page_size, start_id=start_id)
+
+    @instrumented
     async def async_get_trigger_logs(
         self, device_id: str | None = None, page_size: int = 20, start_id: int = 0
     ) -> dict[str, Any] | None:
@@ -301,63 +724,201 @@ class TapoAPI:
                 _LOGGER.warning("S200B/S200D handler not available (device_id: %s)", target_device_id)
                 return None
             
-            s200_handler = await self._hub.s200(target_device_id)
-            trigger_logs = await s200_handler.get_trigger_logs(
-                page_size=page_size, start_id=start_id
+            trigger_logs = await self._async_fetch_trigger_logs(
+                self._hub, target_device_id, page_size, start_id
             )
             
-            return self._parse_trigger_logs(trigger_logs)
+            return await self._async_parse(self._parse_trigger_logs, trigger_logs)
+        except TapoTimeoutError as err:
+            _LOGGER.warning("Trigger logs request timed out (device_id: %s): %s", target_device_id, err)
+            raise
         except Exception as err:
-            error_str = str(err)
-            is_connection_error = (
-                "Connection reset" in error_str
-                or "Connection refused" in error_str
-                or "Connection closed" in error_str
-                or "Connection reset by peer" in error_str
-                or "Http" in str(type(err).__name__)
-            )
-            
-            if is_connection_error:
+            error = classify_error(err)
+            if type(error) in _RECOVERY_START:
                 _LOGGER.warning(
-                    "Connection error while getting trigger logs (device_id: %s): %s. Attempting to re-authenticate...",
+                    "%s while getting trigger logs (device_id: %s): %s. Attempting recovery...",
+                    type(error).__name__,
                     target_device_id,
-                    error_str,
+                    error,
                 )
-                self._authenticated = False
-                self._hub = None
-                self._s200_handler = None
-                
-                if await self.async_authenticate():
-                    _LOGGER.info("Re-authentication successful, retrying trigger logs request...")
-                    try:
-                        target_device_id = device_id or self._device_id
-                        if target_device_id and self._hub:
-                            s200_handler = await self._hub.s200(target_device_id)
-                            trigger_logs = await s200_handler.get_trigger_logs(
-                                page_size=page_size, start_id=start_id
-                            )
-                            
-                            result = self._parse_trigger_logs(trigger_logs)
-                            if result:
-                                _LOGGER.info("Successfully retrieved trigger logs after re-authentication")
-                            return result
-                    except Exception as retry_err:
-                        _LOGGER.error("Failed to get trigger logs after re-authentication: %s", retry_err, exc_info=True)
-                        return None
-                else:
-                    _LOGGER.error("Re-authentication failed after connection error")
-                    return None
-            else:
-                _LOGGER.error("Failed to get trigger logs: %s", err, exc_info=True)
-                return None
+                return await self._async_recover_trigger_logs(
+                    target_device_id, page_size, start_id, error
+                )
+
+            _LOGGER.error("Failed to get trigger logs: %s", err, exc_info=True)
+            self._s200_handlers.pop(target_device_id, None)
+            return None
+
+    async def _async_recover_trigger_logs(
+        self, device_id: str, page_size: int, start_id: int, error: TapoError
+    ) -> dict[str, Any] | None:
+        responses, _ = await self._async_recover_batch([device_id], page_size, start_id, error)
+        if isinstance(response := responses[device_id], Exception):
+            return None
+        return await self._async_parse(self._parse_trigger_logs, response)
+
+    async def _async_recover_batch(
+        self, device_ids: list[str], page_size: int, start_id: int, error: TapoError
+    ) -> tuple[dict[str, Any], str | None]:
+        """Walk the recovery ladder once for the hub until the failed devices answer.
+
+        Retry the requests, then rebuild the S200 handlers, then refresh the hub
+        session, and only then perform a complete login. Returns the raw responses
+        (or exceptions) and the step that recovered, if any.
+        """
+        responses: dict[str, Any] = dict.fromkeys(device_ids, error)
+        start = RECOVERY_STEPS.index(_RECOVERY_START[type(error)])
+        for step in RECOVERY_STEPS[start:]:
+            if step == RECOVERY_SESSION and not hasattr(self._hub, "refresh_session"):
+                # Older library versions cannot refresh a session.
+                continue
+            try:
+                if step == RECOVERY_HANDLER:
+                    for device_id in device_ids:
+                        self._s200_handlers.pop(device_id, None)
+                elif step == RECOVERY_SESSION:
+                    await self._async_call("Session refresh", self._hub.refresh_session)
+                    self._s200_handlers = {}
+                elif step == RECOVERY_LOGIN:
+                    if not await self.async_reconnect():
+                        _LOGGER.error("Re-authentication failed after %s", type(error).__name__)
+                        return responses, None
+            except TapoTimeoutError:
+                raise
+            except Exception as err:
+                _LOGGER.debug("Recovery step '%s' failed on hub %s: %s", step, self.host, classify_error(err))
+                continue
+            finally:
+                # Counted once performed, whether or not it succeeded.
+                self._recovery_counts[step] += 1
+
+            if self._hub is None:
+                continue
+            responses = await self._async_fetch_batch(device_ids, page_size, start_id, False)
+            if not all(isinstance(response, Exception) for response in responses.values()):
+                _LOGGER.info("Recovered trigger logs on hub %s with step '%s'", self.host, step)
+                return responses, step
+            _LOGGER.debug("Recovery step '%s' did not help on hub %s", step, self.host)
+
+        _LOGGER.error("Failed to get trigger logs after all recovery steps: %s", error)
+        return responses, None
+
+    async def async_iter_trigger_history(
+        self, device_id: str, page_size: int = 50
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield every trigger log entry the hub holds for a device, newest first.
+
+        Pages are requested with start_id pagination and entries are yielded as
+        each page arrives, so the full history is never held in memory.
+        """
+        start_id = 0
+        oldest_id: int | None = None
+        while True:
+            page = await self.async_get_trigger_logs(
+                device_id=device_id, page_size=page_size, start_id=start_id
+            )
+            if page is None:
+                raise TapoError(f"Failed to get trigger logs page at start_id {start_id}")
+
+            new_logs = [
+                log
+                for log in page.get("logs", [])
+                if isinstance(log.get("id"), int) and (oldest_id is None or log["id"] < oldest_id)
+            ]
+            if not new_logs:
+                return
+            for log in new_logs:
+                yield log
+
+            oldest_id = min(log["id"] for log in new_logs)
+            if oldest_id <= 1:
+                return
+            # Entries already seen are filtered above, so this works whether the
+            # hub treats start_id as inclusive or exclusive.
+            start_id = oldest_id
+
+    @instrumented
+    async def async_reconnect(self) -> bool:
+        """Drop the current hub session and log in again, keeping event subscribers."""
+        self._authenticated = False
+        self._hub = None
+        self._client = None
+        self._s200_handler = None
+        self._s200_handlers = {}
+        self._invalidate_coalesced()
+        return await self.async_authenticate()
+
+    @classmethod
+    def from_cassette(cls, path: str, speed: float | None = 1.0, **kwargs: Any) -> TapoAPI:
+        """Create an API that replays a recorded cassette instead of talking to a hub.
+
+        Reads the cassette with blocking I/O; call it from the executor inside Home Assistant.
+        """
+        header, records = load_cassette(path)
+        return cls("", "", header["host"], replay_hub=TapoReplayHub(records, speed), **kwargs)
+
+    def start_recording(self, path: str) -> None:
+        """Record every hub response with its timing to a JSON lines cassette."""
+        if self._recorder is not None:
+            raise RuntimeError(f"Already recording to {self._recorder.path}")
+        self._recorder = CassetteRecorder(path, self.host)
+        if self._hub is not None:
+            self._hub = RecordingHub(self._hub, self._recorder)
+            # Recreate the handlers through the recording hub.
+            self._s200_handlers = {}
+        _LOGGER.info("Recording hub responses of %s to %s", self.host, path)
+
+    async def async_stop_recording(self) -> str | None:
+        """Stop recording and return the cassette path."""
+        if (recorder := self._recorder) is None:
+            return None
+        self._recorder = None
+        if isinstance(self._hub, RecordingHub):
+            self._hub = self._hub.hub
+            self._s200_handlers = {}
+        await recorder.async_close()
+        return str(recorder.path)
+
+    @property
+    def recording(self) -> bool:
+        return self._recorder is not None
+
+    def subscribe(
+        self,
+        device_id: str | None = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+    ) -> TapoEventSubscription:
+        """Subscribe to button events from the shared poll stream.
+
+        Usage: ``async for event in api.subscribe(device_id): ...``
+        """
+        return self.events.subscribe(device_id, maxsize, overflow)
 
     def get_last_successful_auth_time(self) -> datetime | None:
         return self._last_successful_auth_time
 
+    def get_timeout_count(self) -> int:
+        return self._timeout_count
+
+    def get_hedged_request_count(self) -> int:
+        return self._hedged_request_count
+
+    def get_recovery_counts(self) -> dict[str, int]:
+        return dict(self._recovery_counts)
+
+    def get_loop_stats(self) -> dict[str, dict[str, Any]]:
+        return self.loop_monitor.get_stats()
+
     async def async_close(self) -> None:
+        await self.async_stop_recording()
+        self.events.close()
         self._authenticated = False
+        self._validated_hub = None
         self._device = None
         self._s200_handler = None
+        self._s200_handlers = {}
+        self._invalidate_coalesced()
         self._hub = None
         self._client = None
 
@@ -1,128 +1,436 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
+import time
+from types import MappingProxyType
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
 
 from .api import TapoAPI
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_BUTTON_EVENT, TRIGGER_TYPES
+from .watchdog import CHECK_INTERVAL, TapoPollWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
+PROBE_PAGE_SIZE = 1
+TRIGGER_LOG_PAGE_SIZE = 10
+
+
+@dataclass(frozen=True)
+class ButtonEventSnapshot:
+    """Display value and attributes of the last button event, built once per event."""
+
+    event_id: int | None
+    native_value: str | None
+    attributes: Mapping[str, Any]
+
+
+def classify_event(event: dict[str, Any]) -> tuple[str, float | None]:
+    """Event type and signed rotation degrees of a parsed trigger log entry."""
+    click_type = event.get("click_type", "unknown")
+    click_type_lower = click_type.lower()
+    if "single" in click_type_lower and "click" in click_type_lower:
+        return "single_click", None
+    elif "double" in click_type_lower and "click" in click_type_lower:
+        return "double_click", None
+    elif "rotate" in click_type_lower or "rotation" in click_type_lower:
+        rotation_degrees = event.get("rotation_degrees") or event.get("params_rotation_degrees")
+        if rotation_degrees is not None:
+            if rotation_degrees > 0:
+                direction = "right"
+            elif rotation_degrees < 0:
+                direction = "left"
+            else:
+                direction = "unknown"
+        else:
+            direction = "unknown"
+            if "left" in click_type_lower or "counterclockwise" in click_type_lower or "ccw" in click_type_lower:
+                direction = "left"
+            elif "right" in click_type_lower or "clockwise" in click_type_lower or "cw" in click_type_lower:
+                direction = "right"
+        return f"rotate_{direction}", rotation_degrees
+    else:
+        return click_type_lower.replace("click", "_click"), None
+
+
+def _format_event_value(last_event: dict[str, Any]) -> str:
+    event_type, rotation_degrees = classify_event(last_event)
+    if event_type.startswith("rotate_"):
+        direction = event_type.removeprefix("rotate_").title()
+        if rotation_degrees is not None:
+            return f"Rotate {direction} ({abs(rotation_degrees)}°)"
+        return f"Rotate {direction}"
+    return event_type.replace("_", " ").title()
+
+
+def build_event_snapshot(last_event: dict[str, Any] | None) -> ButtonEventSnapshot:
+    if not last_event:
+        return ButtonEventSnapshot(None, None, MappingProxyType({}))
+
+    attrs: dict[str, Any] = {}
+    timestamp = last_event.get("timestamp")
+    if timestamp:
+        dt = datetime.fromtimestamp(timestamp)
+        attrs["last_event_time"] = dt.isoformat()
+        attrs["last_event_time_readable"] = dt.strftime("%Y-%m-%d %H:%M:%S")
+    attrs["last_event_id"] = last_event.get("id")
+    attrs["last_event_type"] = last_event.get("click_type")
+    rotation_degrees = last_event.get("rotation_degrees") or last_event.get("params_rotation_degrees")
+    if rotation_degrees is not None:
+        attrs["last_rotation_degrees"] = abs(rotation_degrees)
+        attrs["last_rotation_direction"] = "right" if rotation_degrees > 0 else "left" if rotation_degrees < 0 else "unknown"
+
+    return ButtonEventSnapshot(
+        last_event.get("id"), _format_event_value(last_event), MappingProxyType(attrs)
+    )
+
+
+EMPTY_SNAPSHOT = build_event_snapshot(None)
+
+
+def build_event_data(device_id: str, event: dict[str, Any]) -> dict[str, Any]:
+    """Convert a parsed trigger log entry to the tapo_button_pressed event data."""
+    event_type, rotation_degrees = classify_event(event)
+    event_data: dict[str, Any] = {
+        "device_id": device_id,
+        "event_id": event.get("id"),
+        "timestamp": event.get("timestamp"),
+    }
+    
+    if rotation_degrees is not None:
+        event_data["rotation_degrees"] = abs(rotation_degrees)
+        event_data["direction"] = event_type.removeprefix("rotate_")
+    elif event_type not in TRIGGER_TYPES and not event_type.startswith("rotate_"):
+        _LOGGER.info(
+            "Detected event type: %s (original: %s)", event_type, event.get("click_type", "unknown")
+        )
+    
+    event_data["click_type"] = event_type
+    return event_data
+
 
 class TapoButtonCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, api: TapoAPI, device_id: str, poll_interval: float = 1.0) -> None:
+    """Button event state for one device.
+
+    Scheduled polling is done by TapoEventPoller for all buttons of a hub at once;
+    this coordinator only fetches on its own for the first refresh.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, api: TapoAPI, device_id: str, poll_interval: float | None = 1.0
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_button_events_{device_id}",
-            update_interval=timedelta(seconds=poll_interval),
+            update_interval=None,
         )
         self.api = api
         self.device_id = device_id
+        self.poll_interval = poll_interval
         self._last_processed_id: int | None = None
+        self._last_log_marker: tuple[Any, Any] | None = None
         self._last_successful_update_time: datetime | None = None
+        self._snapshot = EMPTY_SNAPSHOT
 
     def get_last_successful_update_time(self) -> datetime | None:
         return self._last_successful_update_time
 
+    def _get_snapshot(self, last_event: dict[str, Any] | None) -> ButtonEventSnapshot:
+        """Reuse the current snapshot unless the last event changed."""
+        event_id = last_event.get("id") if last_event else None
+        if event_id is None or event_id != self._snapshot.event_id:
+            self._snapshot = build_event_snapshot(last_event)
+        return self._snapshot
+
+    def needs_full_fetch(self, probe: dict[str, Any] | None) -> bool:
+        """Whether the probe shows changes that require fetching the full page.
+
+        The probe is a single-entry page: when the newest log id and the hub's log
+        counter are unchanged there is nothing new to fetch or parse.
+        """
+        if probe is None or self.data is None:
+            return probe is not None
+        marker = (probe.get("start_id"), probe.get("sum"))
+        return marker[0] is None or marker != self._last_log_marker
+
     async def _async_update_data(self) -> dict[str, Any]:
         _LOGGER.debug("Updating button coordinator data for device %s", self.device_id)
         try:
-            trigger_logs = await self.api.async_get_trigger_logs(device_id=self.device_id, page_size=10, start_id=0)
-            if trigger_logs is None:
-                _LOGGER.warning("Failed to get trigger logs, returning empty dict")
-                return {"logs": [], "new_events": [], "last_event": None}
-
-            logs = trigger_logs.get("logs", [])
-            new_events: list[dict[str, Any]] = []
-
-            if logs:
-                if self._last_processed_id is None:
-                    if logs:
-                        self._last_processed_id = logs[0].get("id")
-                        _LOGGER.debug("Initialized last_processed_id to %s", self._last_processed_id)
-                else:
-                    for log_entry in logs:
-                        log_id = log_entry.get("id")
-                        if log_id and log_id > self._last_processed_id:
-                            new_events.append(log_entry)
-                            click_type = log_entry.get("click_type", "unknown")
-                            _LOGGER.info("New button event detected: %s (ID: %s)", 
-                                       click_type, log_id)
-                    
-                    if new_events:
-                        self._last_processed_id = new_events[0].get("id")
-                        self._fire_events(new_events)
-
-            last_event = logs[0] if logs else None
-            self._last_successful_update_time = datetime.now()
-            return {"logs": logs, "new_events": new_events, "last_event": last_event}
-        except asyncio.TimeoutError as err:
-            _LOGGER.warning("Timeout while getting trigger logs: %s", err)
-            return {"logs": [], "new_events": [], "last_event": None}
+            probe = await self.api.async_get_trigger_logs(
+                device_id=self.device_id, page_size=PROBE_PAGE_SIZE, start_id=0
+            )
+            trigger_logs = None
+            if self.needs_full_fetch(probe):
+                trigger_logs = await self.api.async_get_trigger_logs(
+                    device_id=self.device_id, page_size=TRIGGER_LOG_PAGE_SIZE, start_id=0
+                )
+            return self.process_trigger_logs(probe, trigger_logs)
         except Exception as err:
+            return self.process_poll_error(err)
+
+    @callback
+    def async_handle_trigger_logs(
+        self, probe: dict[str, Any] | None, trigger_logs: dict[str, Any] | None
+    ) -> None:
+        self.async_set_updated_data(self.process_trigger_logs(probe, trigger_logs))
+
+    @callback
+    def async_handle_poll_error(self, err: Exception) -> None:
+        self.async_set_updated_data(self.process_poll_error(err))
+
+    def process_poll_error(self, err: Exception) -> dict[str, Any]:
+        if isinstance(err, asyncio.TimeoutError):
+            _LOGGER.warning("Timeout while getting trigger logs: %s", err)
+        else:
             _LOGGER.error("Unexpected error updating button coordinator: %s", err, exc_info=True)
-            return {"logs": [], "new_events": [], "last_event": None}
+        self._last_log_marker = None
+        return {"logs": [], "new_events": [], "last_event": None, "snapshot": EMPTY_SNAPSHOT}
+
+    def process_trigger_logs(
+        self, probe: dict[str, Any] | None, trigger_logs: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        if probe is None:
+            _LOGGER.warning("Failed to probe trigger logs, returning empty dict")
+            self._last_log_marker = None
+            return {"logs": [], "new_events": [], "last_event": None, "snapshot": EMPTY_SNAPSHOT}
+
+        if not self.needs_full_fetch(probe):
+            self._last_successful_update_time = datetime.now()
+            return {**self.data, "new_events": []}
+
+        if trigger_logs is None:
+            _LOGGER.warning("Failed to get trigger logs, returning empty dict")
+            self._last_log_marker = None
+            return {"logs": [], "new_events": [], "last_event": None, "snapshot": EMPTY_SNAPSHOT}
+
+        self._last_log_marker = (trigger_logs.get("start_id"), trigger_logs.get("sum"))
+
+        logs = trigger_logs.get("logs", [])
+        new_events: list[dict[str, Any]] = []
+
+        if logs:
+            if self._last_processed_id is None:
+                if logs:
+                    self._last_processed_id = logs[0].get("id")
+                    _LOGGER.debug("Initialized last_processed_id to %s", self._last_processed_id)
+            else:
+                for log_entry in logs:
+                    log_id = log_entry.get("id")
+                    if log_id and log_id > self._last_processed_id:
+                        new_events.append(log_entry)
+                        click_type = log_entry.get("click_type", "unknown")
+                        _LOGGER.info("New button event detected: %s (ID: %s)", 
+                                   click_type, log_id)
+                
+                if new_events:
+                    self._last_processed_id = new_events[0].get("id")
+                    self._fire_events(new_events)
+
+        last_event = logs[0] if logs else None
+        self._last_successful_update_time = datetime.now()
+        return {
+            "logs": logs,
+            "new_events": new_events,
+            "last_event": last_event,
+            "snapshot": self._get_snapshot(last_event),
+        }
 
     @callback
     def _fire_events(self, new_events: list[dict[str, Any]]) -> None:
         for event in reversed(new_events):
-            click_type = event.get("click_type", "unknown")
-            timestamp = event.get("timestamp")
-            event_id = event.get("id")
-            
-            click_type_lower = click_type.lower()
-            event_data: dict[str, Any] = {
-                "device_id": self.device_id,
-                "event_id": event_id,
-                "timestamp": timestamp,
-            }
-            
-            if "single" in click_type_lower and "click" in click_type_lower:
-                event_type = "single_click"
-            elif "double" in click_type_lower and "click" in click_type_lower:
-                event_type = "double_click"
-            elif "rotate" in click_type_lower or "rotation" in click_type_lower:
-                rotation_degrees = event.get("rotation_degrees") or event.get("params_rotation_degrees")
-                if rotation_degrees is not None:
-                    if rotation_degrees > 0:
-                        direction = "right"
-                    elif rotation_degrees < 0:
-                        direction = "left"
-                    else:
-                        direction = "unknown"
-                    event_type = f"rotate_{direction}"
-                    event_data["rotation_degrees"] = abs(rotation_degrees)
-                    event_data["direction"] = direction
-                else:
-                    direction = "unknown"
-                    if "left" in click_type_lower or "counterclockwise" in click_type_lower or "ccw" in click_type_lower:
-                        direction = "left"
-                    elif "right" in click_type_lower or "clockwise" in click_type_lower or "cw" in click_type_lower:
-                        direction = "right"
-                    event_type = f"rotate_{direction}"
-            else:
-                event_type = click_type.lower().replace("click", "_click").replace("_", "_")
-                _LOGGER.info("Detected event type: %s (original: %s)", event_type, click_type)
-            
-            event_data["click_type"] = event_type
+            event_data = build_event_data(self.device_id, event)
+            event_type = event_data["click_type"]
+            event_id = event_data["event_id"]
             
             self.hass.bus.async_fire(
                 f"{DOMAIN}_button_pressed",
                 event_data,
             )
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_BUTTON_EVENT.format(self.device_id, event_type),
+                event_data,
+            )
+            self.api.events.publish(self.device_id, event_data)
             _LOGGER.info("Fired button event for device %s: %s (ID: %s)", self.device_id, event_type, event_id)
 
 
+class TapoEventPoller:
+    """Poll the trigger logs of every button on a hub in one batch per tick.
+
+    Each device has its own interval. The poller ticks at the shortest one and
+    every tick batches the devices that are due, so slow devices ride along with
+    fast ones instead of costing extra hub requests.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: TapoAPI,
+        poll_interval: float,
+        watchdog: TapoPollWatchdog | None = None,
+    ) -> None:
+        self.hass = hass
+        self.api = api
+        self.poll_interval = poll_interval
+        self.watchdog = watchdog
+        self._coordinators: dict[str, TapoButtonCoordinator] = {}
+        self._intervals: dict[str, float | None] = {}
+        self._next_due: dict[str, float] = {}
+        self._tick_interval: float | None = None
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self._unsub_watchdog: CALLBACK_TYPE | None = None
+        self._polling = False
+
+    def add_coordinator(self, coordinator: TapoButtonCoordinator) -> None:
+        self._coordinators[coordinator.device_id] = coordinator
+        self._intervals[coordinator.device_id] = coordinator.poll_interval
+
+    @property
+    def device_ids(self) -> list[str]:
+        return list(self._coordinators)
+
+    def get_device_interval(self, device_id: str) -> float | None:
+        return self._intervals.get(device_id)
+
+    @callback
+    def set_device_interval(self, device_id: str, interval: float | None) -> None:
+        """Change how often a device is polled, None to stop polling it."""
+        coordinator = self._coordinators.get(device_id)
+        if coordinator is None or self._intervals.get(device_id) == interval:
+            return
+
+        self._intervals[device_id] = interval
+        coordinator.poll_interval = interval
+        self._next_due.pop(device_id, None)
+        if interval is None and self.watchdog is not None:
+            self.watchdog.forget(device_id)
+        if self._unsub_tick is not None:
+            self._schedule()
+
+    def _get_tick_interval(self) -> float | None:
+        return min((interval for interval in self._intervals.values() if interval), default=None)
+
+    @callback
+    def _schedule(self) -> None:
+        tick_interval = self._get_tick_interval()
+        if self._unsub_tick is not None and tick_interval == self._tick_interval:
+            return
+
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        self._tick_interval = tick_interval
+        if tick_interval is None:
+            # Every device is paused; keep a slow tick so the poller stays started.
+            tick_interval = self.poll_interval
+        self._unsub_tick = async_track_time_interval(
+            self.hass,
+            self._async_tick,
+            timedelta(seconds=tick_interval),
+        )
+
+    @callback
+    def async_start(self) -> None:
+        if self._unsub_tick is None:
+            self._schedule()
+        if self.watchdog is not None and self._unsub_watchdog is None:
+            # The watchdog runs on its own timer so a hung poll cannot hide a stall.
+            self._unsub_watchdog = async_track_time_interval(
+                self.hass,
+                self._async_check_watchdog,
+                timedelta(seconds=CHECK_INTERVAL),
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        if self._unsub_watchdog is not None:
+            self._unsub_watchdog()
+            self._unsub_watchdog = None
+
+    async def _async_check_watchdog(self, now: datetime) -> None:
+        if self.watchdog is not None:
+            await self.watchdog.async_check()
+
+    def _get_due_device_ids(self) -> list[str]:
+        now = time.monotonic()
+        # Half a tick of slack keeps timer jitter from pushing a device to the next tick.
+        slack = (self._tick_interval or 0) / 2
+        due = []
+        for device_id, interval in self._intervals.items():
+            if interval is None:
+                continue
+            if self._next_due.get(device_id, 0.0) <= now + slack:
+                due.append(device_id)
+                self._next_due[device_id] = now + interval
+        return due
+
+    async def _async_tick(self, now: datetime) -> None:
+        if self._polling:
+            _LOGGER.debug("Previous event poll still running, skipping tick")
+            return
+        if not (device_ids := self._get_due_device_ids()):
+            return
+
+        self._polling = True
+        if self.watchdog is not None:
+            self.watchdog.record_poll_started()
+        try:
+            await self.async_poll(device_ids)
+        finally:
+            self._polling = False
+            if self.watchdog is not None:
+                self.watchdog.record_poll_finished()
+
+    async def async_poll(self, device_ids: list[str] | None = None) -> None:
+        if device_ids is None:
+            device_ids = self.device_ids
+        coordinators = [self._coordinators[device_id] for device_id in device_ids]
+        try:
+            probes = await self.api.async_get_trigger_logs_batch(
+                [coordinator.device_id for coordinator in coordinators],
+                page_size=PROBE_PAGE_SIZE,
+            )
+            changed = [
+                coordinator.device_id
+                for coordinator in coordinators
+                if coordinator.needs_full_fetch(probes.get(coordinator.device_id))
+            ]
+            full_pages = (
+                await self.api.async_get_trigger_logs_batch(changed, page_size=TRIGGER_LOG_PAGE_SIZE)
+                if changed
+                else {}
+            )
+        except Exception as err:
+            for coordinator in coordinators:
+                coordinator.async_handle_poll_error(err)
+                if self.watchdog is not None:
+                    self.watchdog.record_poll(coordinator.device_id, None)
+        else:
+            for coordinator in coordinators:
+                probe = probes.get(coordinator.device_id)
+                coordinator.async_handle_trigger_logs(probe, full_pages.get(coordinator.device_id))
+                if self.watchdog is not None:
+                    self.watchdog.record_poll(coordinator.device_id, probe)
+
+
 class TapoButtonSensor(CoordinatorEntity, SensorEntity):
     def __init__(
         self,
@@ -135,37 +443,15 @@ class TapoButtonSensor(CoordinatorEntity, SensorEntity):
         self._device_id = device_id
         self._attr_name = f"{device_nickname} Last Button Press"
         self._attr_unique_id = f"{config_entry_id}_{device_id}_last_button_press"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name=device_nickname,
+            manufacturer="TP-Link",
+        )
 
     @property
     def native_value(self) -> str | None:
-        last_event = self.coordinator.data.get("last_event")
-        if last_event:
-            click_type = last_event.get("click_type", "unknown")
-            click_type_lower = click_type.lower()
-            if "single" in click_type_lower and "click" in click_type_lower:
-                return "Single Click"
-            elif "double" in click_type_lower and "click" in click_type_lower:
-                return "Double Click"
-            elif "rotate" in click_type_lower or "rotation" in click_type_lower:
-                rotation_degrees = last_event.get("rotation_degrees") or last_event.get("params_rotation_degrees")
-                if rotation_degrees is not None:
-                    if rotation_degrees > 0:
-                        direction = "Right"
-                    elif rotation_degrees < 0:
-                        direction = "Left"
-                    else:
-                        direction = "Unknown"
-                    return f"Rotate {direction} ({abs(rotation_degrees)}°)"
-                else:
-                    direction = "Unknown"
-                    if "left" in click_type_lower or "counterclockwise" in click_type_lower or "ccw" in click_type_lower:
-                        direction = "Left"
-                    elif "right" in click_type_lower or "clockwise" in click_type_lower or "cw" in click_type_lower:
-                        direction = "Right"
-                    return f"Rotate {direction}"
-            else:
-                return click_type.replace("Click", " Click").replace("_", " ").title()
-        return None
+        return self.coordinator.data.get("snapshot", EMPTY_SNAPSHOT).native_value
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -175,19 +461,6 @@ class TapoButtonSensor(CoordinatorEntity, SensorEntity):
             last_update = self.coordinator.get_last_successful_update_time()
             attrs["last_successful_update"] = last_update.isoformat() if last_update else "Never"
         
-        last_event = self.coordinator.data.get("last_event")
-        if last_event:
-            timestamp = last_event.get("timestamp")
-            if timestamp:
-                dt = datetime.fromtimestamp(timestamp)
-                attrs["last_event_time"] = dt.isoformat()
-                attrs["last_event_time_readable"] = dt.strftime("%Y-%m-%d %H:%M:%S")
-            attrs["last_event_id"] = last_event.get("id")
-            attrs["last_event_type"] = last_event.get("click_type")
-            rotation_degrees = last_event.get("rotation_degrees") or last_event.get("params_rotation_degrees")
-            if rotation_degrees is not None:
-                attrs["last_rotation_degrees"] = abs(rotation_degrees)
-                attrs["last_rotation_direction"] = "right" if rotation_degrees > 0 else "left" if rotation_degrees < 0 else "unknown"
+        attrs.update(self.coordinator.data.get("snapshot", EMPTY_SNAPSHOT).attributes)
         
         return attrs
-
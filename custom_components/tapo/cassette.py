@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+OP_CHILD_DEVICE_LIST = "child_device_list"
+OP_TRIGGER_LOGS = "trigger_logs"
+
+# Library objects are captured this many levels deep; deeper values are stored as text.
+MAX_DEPTH = 4
+FLUSH_EVERY = 50
+
+
+def dump_value(value: Any, depth: int = 0) -> Any:
+    """Capture a library response as JSON, keeping the shape the parsers see.
+
+    Objects keep their type name, public attributes, whether they have a
+    __dict__ and their to_dict() output, so firmware differences in response
+    shape survive a round trip through the cassette.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [dump_value(item, depth) for item in value]
+    if isinstance(value, dict):
+        return {str(key): dump_value(item, depth + 1) for key, item in value.items()}
+    if depth >= MAX_DEPTH:
+        return {"__str__": str(value)}
+
+    attrs: dict[str, Any] = {}
+    for name in dir(value):
+        if name.startswith("_"):
+            continue
+        try:
+            attr = getattr(value, name)
+        except Exception:
+            continue
+        if callable(attr):
+            continue
+        if type(attr) is type(value):
+            # Enum-like values list their variants as attributes of the same type.
+            return {"__str__": str(value)}
+        attrs[name] = dump_value(attr, depth + 1)
+
+    captured: dict[str, Any] = {"__type__": type(value).__name__, "attrs": attrs}
+    if hasattr(value, "__dict__"):
+        captured["has_dict"] = True
+    if callable(to_dict := getattr(value, "to_dict", None)):
+        try:
+            captured["to_dict"] = dump_value(to_dict(), depth + 1)
+        except Exception:
+            pass
+    return captured
+
+
+class _ReplayObject:
+    __slots__ = ("_replay_attrs", "_replay_to_dict")
+
+    def __init__(self, attrs: dict[str, Any], to_dict: Any) -> None:
+        object.__setattr__(self, "_replay_attrs", attrs)
+        object.__setattr__(self, "_replay_to_dict", to_dict)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._replay_attrs[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __dir__(self) -> list[str]:
+        return [*super().__dir__(), *self._replay_attrs]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._replay_attrs})"
+
+
+class _ReplayDictObject:
+    __slots__ = ("_replay_to_dict", "__dict__")
+
+    def __init__(self, attrs: dict[str, Any], to_dict: Any) -> None:
+        self.__dict__.update(attrs)
+        self._replay_to_dict = to_dict
+
+
+def _replay_to_dict(self: Any) -> Any:
+    return load_value(self._replay_to_dict)
+
+
+_replay_classes: dict[tuple[str, bool, bool], type] = {}
+
+
+def _get_replay_class(name: str, has_dict: bool, has_to_dict: bool) -> type:
+    key = (name, has_dict, has_to_dict)
+    if (cls := _replay_classes.get(key)) is None:
+        namespace: dict[str, Any] = {"__slots__": ()}
+        if has_to_dict:
+            namespace["to_dict"] = _replay_to_dict
+        # Keep the recorded class name; the parsers derive click types from it.
+        base = _ReplayDictObject if has_dict else _ReplayObject
+        cls = _replay_classes[key] = type(name, (base,), namespace)
+    return cls
+
+
+def load_value(data: Any) -> Any:
+    """Rebuild a value captured by dump_value."""
+    if isinstance(data, list):
+        return [load_value(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    if "__str__" in data:
+        return data["__str__"]
+    if "__type__" not in data:
+        return {key: load_value(item) for key, item in data.items()}
+
+    has_to_dict = "to_dict" in data
+    cls = _get_replay_class(data["__type__"], data.get("has_dict", False), has_to_dict)
+    attrs = {key: load_value(item) for key, item in data["attrs"].items()}
+    return cls(attrs, data["to_dict"] if has_to_dict else None)
+
+
+class CassetteRecorder:
+    """Append hub responses with their timing to a JSON lines cassette."""
+
+    def __init__(self, path: str | Path, host: str) -> None:
+        self.path = Path(path)
+        self.host = host
+        self.count = 0
+        self._started = time.monotonic()
+        self._lines: list[str] = [
+            self._encode(
+                {"cassette": CASSETTE_VERSION, "host": host, "recorded": datetime.now().isoformat()}
+            )
+        ]
+        self._truncate = True
+        self._flush_lock = asyncio.Lock()
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def _encode(record: dict[str, Any]) -> str:
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def record(
+        self,
+        op: str,
+        started: float,
+        response: Any = None,
+        error: Exception | None = None,
+        **request: Any,
+    ) -> None:
+        now = time.monotonic()
+        entry: dict[str, Any] = {
+            "t": round(started - self._started, 3),
+            "op": op,
+            **request,
+            "duration": round(now - started, 3),
+        }
+        if error is not None:
+            entry["error"] = str(error)
+        else:
+            entry["response"] = dump_value(response)
+        self._lines.append(self._encode(entry))
+        self.count += 1
+
+        if len(self._lines) >= FLUSH_EVERY:
+            task = asyncio.get_running_loop().create_task(self.async_flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    def _write(self, lines: list[str], truncate: bool) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w" if truncate else "a", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    async def async_flush(self) -> None:
+        async with self._flush_lock:
+            if not self._lines:
+                return
+            lines, self._lines = self._lines, []
+            truncate, self._truncate = self._truncate, False
+            await asyncio.get_running_loop().run_in_executor(None, self._write, lines, truncate)
+
+    async def async_close(self) -> None:
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks)
+        await self.async_flush()
+        _LOGGER.info("Recorded %d hub responses to %s", self.count, self.path)
+
+
+class RecordingS200Handler:
+    def __init__(self, handler: Any, device_id: str, recorder: CassetteRecorder) -> None:
+        self.handler = handler
+        self.device_id = device_id
+        self.recorder = recorder
+
+    async def get_trigger_logs(self, page_size: int, start_id: int) -> Any:
+        started = time.monotonic()
+        request = {"device_id": self.device_id, "page_size": page_size, "start_id": start_id}
+        try:
+            response = await self.handler.get_trigger_logs(page_size=page_size, start_id=start_id)
+        except Exception as err:
+            self.recorder.record(OP_TRIGGER_LOGS, started, error=err, **request)
+            raise
+        self.recorder.record(OP_TRIGGER_LOGS, started, response, **request)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.handler, name)
+
+
+class RecordingHub:
+    """Wrap a hub handler and record the responses the integration parses."""
+
+    def __init__(self, hub: Any, recorder: CassetteRecorder) -> None:
+        self.hub = hub
+        self.recorder = recorder
+
+    async def get_child_device_list(self) -> Any:
+        started = time.monotonic()
+        try:
+            response = await self.hub.get_child_device_list()
+        except Exception as err:
+            self.recorder.record(OP_CHILD_DEVICE_LIST, started, error=err)
+            raise
+        self.recorder.record(OP_CHILD_DEVICE_LIST, started, response)
+        return response
+
+    async def s200(self, device_id: str) -> RecordingS200Handler:
+        return RecordingS200Handler(await self.hub.s200(device_id), device_id, self.recorder)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.hub, name)
+
+
+def load_cassette(path: str | Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read a cassette; returns its header and records. Does blocking I/O."""
+    with Path(path).open(encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines or lines[0].get("cassette") != CASSETTE_VERSION:
+        raise ValueError(f"{path} is not a version {CASSETTE_VERSION} Tapo cassette")
+    return lines[0], lines[1:]
+
+
+class ReplayS200Handler:
+    def __init__(self, hub: TapoReplayHub, device_id: str) -> None:
+        self.hub = hub
+        self.device_id = device_id
+
+    async def get_trigger_logs(self, page_size: int, start_id: int) -> Any:
+        return await self.hub.async_replay(
+            OP_TRIGGER_LOGS, device_id=self.device_id, page_size=page_size, start_id=start_id
+        )
+
+
+class TapoReplayHub:
+    """Serve recorded hub responses in place of a hub handler.
+
+    With speed None every request returns the next recorded response for the
+    same request, without waiting, which makes replays deterministic. With a
+    speed, the cassette is played against a clock running that many times
+    faster than real time: each request gets the latest response recorded up
+    to that point and waits for the recorded duration, scaled by the speed.
+    """
+
+    def __init__(self, records: list[dict[str, Any]], speed: float | None = 1.0) -> None:
+        self.speed = speed
+        self.requests = 0
+        self._records: dict[tuple[Any, ...], list[dict[str, Any]]] = {}
+        for record in records:
+            self._records.setdefault(self._key(record), []).append(record)
+        self._positions: dict[tuple[Any, ...], int] = {}
+        self._started: float | None = None
+
+    @staticmethod
+    def _key(request: dict[str, Any]) -> tuple[Any, ...]:
+        return (
+            request["op"],
+            request.get("device_id"),
+            request.get("page_size"),
+            request.get("start_id"),
+        )
+
+    def _next_record(self, key: tuple[Any, ...]) -> dict[str, Any] | None:
+        records = self._records.get(key)
+        if not records:
+            return None
+
+        if self.speed is None:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return records[min(position, len(records) - 1)]
+
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        elapsed = (now - self._started) * self.speed
+        record = records[0]
+        for candidate in records:
+            if candidate["t"] > elapsed:
+                break
+            record = candidate
+        return record
+
+    async def async_replay(self, op: str, **request: Any) -> Any:
+        self.requests += 1
+        key = self._key({"op": op, **request})
+        record = self._next_record(key)
+        if record is None and op == OP_TRIGGER_LOGS:
+            # Fall back to a page of another size from the same device, so a
+            # capture made with different page sizes still replays.
+            # Prefer the largest page, it can be cut down to the requested size.
+            candidates = [
+                other_key
+                for other_key in self._records
+                if other_key[:2] == key[:2] and other_key[3] == key[3]
+            ]
+            if candidates:
+                record = self._next_record(max(candidates, key=lambda other_key: other_key[2] or 0))
+        if record is None:
+            raise Exception(f"No recorded response for {op} {request}")
+
+        if self.speed:
+            await asyncio.sleep(record["duration"] / self.speed)
+        if "error" in record:
+            raise Exception(record["error"])
+
+        response = load_value(record["response"])
+        if op == OP_TRIGGER_LOGS and isinstance(getattr(response, "logs", None), list):
+            page_size = request["page_size"]
+            if len(response.logs) > page_size:
+                if isinstance(response, _ReplayObject):
+                    response._replay_attrs["logs"] = response.logs[:page_size]
+                else:
+                    response.logs = response.logs[:page_size]
+        return response
+
+    async def get_child_device_list(self) -> Any:
+        return await self.async_replay(OP_CHILD_DEVICE_LIST)
+
+    async def s200(self, device_id: str) -> ReplayS200Handler:
+        return ReplayS200Handler(self, device_id)
+
+    async def refresh_session(self) -> None:
+        return None
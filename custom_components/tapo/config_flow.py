@@ -8,12 +8,28 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import device_registry as dr
 
+from . import async_store_validated_api
 from .api import TapoAPI
 from .const import (
+    CONF_DEVICE_ID,
+    CONF_DEVICE_PROFILES,
     CONF_EVENT_POLL_INTERVAL,
+    CONF_HEDGE_DELAY,
+    CONF_OFFLOAD_PARSING,
+    CONF_PROFILE,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SENSOR_POLL_INTERVAL,
+    CONF_SLOW_STEP_THRESHOLD,
     DEFAULT_EVENT_POLL_INTERVAL,
+    DEFAULT_HEDGE_DELAY,
+    DEFAULT_SLOW_STEP_THRESHOLD,
+    DEFAULT_TIMEOUT,
     DOMAIN,
+    PROFILE_CUSTOM,
+    PROFILE_NORMAL,
+    PROFILES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -71,9 +87,8 @@ class TapoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
             try:
-                auth_result = await api.async_authenticate()
-                if auth_result:
-                    await api.async_close()
+                if await api.async_validate_credentials():
+                    async_store_validated_api(self.hass, api)
                     return self.async_create_entry(
                         title=f"Tapo {user_input[CONF_HOST]}",
                         data=user_input,
@@ -82,8 +97,7 @@ class TapoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception as err:
                 _LOGGER.exception("Connection error during authentication: %s", err)
                 errors["base"] = "cannot_connect"
-            finally:
-                await api.async_close()
+            await api.async_close()
 
         return self.async_show_form(
             step_id="user",
@@ -101,48 +115,126 @@ class TapoOptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        errors: dict[str, str] = {}
+        if not self._get_device_names():
+            return await self.async_step_connection(user_input)
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=["connection", "device_profiles"],
+        )
+
+    def _get_device_names(self) -> dict[str, str]:
+        """Devices of the loaded entry, by device_id."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id, {})
+        event_poller = entry_data.get("event_poller")
+        if event_poller is None:
+            return {}
+
+        device_registry = dr.async_get(self.hass)
+        names = {}
+        for device_id in event_poller.device_ids:
+            device = device_registry.async_get_device(identifiers={(DOMAIN, device_id)})
+            names[device_id] = (device.name_by_user or device.name) if device else device_id
+        return names
+
+    async def async_step_device_profiles(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
         config_entry = self.config_entry
+        device_profiles = config_entry.options.get(CONF_DEVICE_PROFILES, {})
 
         if user_input is not None:
-            if config_entry.entry_id in self.hass.data.get(DOMAIN, {}):
-                entry_data = self.hass.data[DOMAIN][config_entry.entry_id]
-                if "api" in entry_data:
-                    await entry_data["api"].async_close()
+            settings = {CONF_PROFILE: user_input[CONF_PROFILE]}
+            if user_input[CONF_PROFILE] == PROFILE_CUSTOM:
+                for key in (CONF_EVENT_POLL_INTERVAL, CONF_SENSOR_POLL_INTERVAL):
+                    if key in user_input:
+                        settings[key] = user_input[key]
+            # Saving only the profiles is picked up live, without reloading the entry.
+            return self.async_create_entry(
+                data={
+                    **config_entry.options,
+                    CONF_DEVICE_PROFILES: {**device_profiles, user_input[CONF_DEVICE_ID]: settings},
+                }
+            )
 
+        return self.async_show_form(
+            step_id="device_profiles",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_DEVICE_ID): vol.In(self._get_device_names()),
+                    vol.Required(CONF_PROFILE, default=PROFILE_NORMAL): vol.In(PROFILES),
+                    vol.Optional(
+                        CONF_EVENT_POLL_INTERVAL,
+                        description="Custom profile: event polling interval in seconds (0.1-30)",
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=30.0)),
+                    vol.Optional(
+                        CONF_SENSOR_POLL_INTERVAL,
+                        description="Custom profile: battery and signal polling interval in seconds (10-3600)",
+                    ): vol.All(vol.Coerce(float), vol.Range(min=10.0, max=3600.0)),
+                }
+            ),
+        )
+
+    async def async_step_connection(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        errors: dict[str, str] = {}
+        config_entry = self.config_entry
+
+        if user_input is not None:
             api = TapoAPI(
                 user_input[CONF_USERNAME],
                 user_input[CONF_PASSWORD],
                 user_input[CONF_HOST],
             )
 
+            # The running entry keeps polling with its own session while the new
+            # credentials are validated; it is only reloaded once they are proven.
             try:
-                auth_result = await api.async_authenticate()
-                if auth_result:
-                    await api.async_close()
+                if await api.async_validate_credentials():
+                    async_store_validated_api(self.hass, api)
                     updated_data = dict(config_entry.data)
                     updated_data.update({
                         CONF_USERNAME: user_input[CONF_USERNAME],
                         CONF_PASSWORD: user_input[CONF_PASSWORD],
                         CONF_HOST: user_input[CONF_HOST],
                     })
-                    self.hass.config_entries.async_update_entry(
-                        config_entry, data=updated_data
-                    )
                     current_interval = (
                         config_entry.options.get(CONF_EVENT_POLL_INTERVAL)
                         or config_entry.data.get(CONF_EVENT_POLL_INTERVAL)
                         or DEFAULT_EVENT_POLL_INTERVAL
                     )
-                    return self.async_create_entry(
-                        data={CONF_EVENT_POLL_INTERVAL: user_input.get(CONF_EVENT_POLL_INTERVAL, current_interval)}
+                    updated_options = {
+                        **config_entry.options,
+                        CONF_EVENT_POLL_INTERVAL: user_input.get(CONF_EVENT_POLL_INTERVAL, current_interval),
+                        CONF_REQUEST_TIMEOUT: user_input.get(
+                            CONF_REQUEST_TIMEOUT,
+                            config_entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_TIMEOUT),
+                        ),
+                        CONF_HEDGE_DELAY: user_input.get(
+                            CONF_HEDGE_DELAY,
+                            config_entry.options.get(CONF_HEDGE_DELAY, DEFAULT_HEDGE_DELAY),
+                        ),
+                        CONF_OFFLOAD_PARSING: user_input.get(
+                            CONF_OFFLOAD_PARSING,
+                            config_entry.options.get(CONF_OFFLOAD_PARSING, False),
+                        ),
+                        CONF_SLOW_STEP_THRESHOLD: user_input.get(
+                            CONF_SLOW_STEP_THRESHOLD,
+                            config_entry.options.get(
+                                CONF_SLOW_STEP_THRESHOLD, DEFAULT_SLOW_STEP_THRESHOLD
+                            ),
+                        ),
+                    }
+                    # Update data and options together so the entry reloads only once.
+                    self.hass.config_entries.async_update_entry(
+                        config_entry, data=updated_data, options=updated_options
                     )
+                    return self.async_create_entry(data=updated_options)
                 errors["base"] = "invalid_auth"
             except Exception as err:
                 _LOGGER.exception("Connection error during authentication: %s", err)
                 errors["base"] = "cannot_connect"
-            finally:
-                await api.async_close()
+            await api.async_close()
 
         event_poll_interval = (
             config_entry.options.get(CONF_EVENT_POLL_INTERVAL)
@@ -151,7 +243,7 @@ class TapoOptionsFlowHandler(config_entries.OptionsFlow):
         )
 
         return self.async_show_form(
-            step_id="init",
+            step_id="connection",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -171,6 +263,28 @@ class TapoOptionsFlowHandler(config_entries.OptionsFlow):
                         default=event_poll_interval,
                         description="Event polling interval in seconds (0.1-10)",
                     ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10.0)),
+                    vol.Optional(
+                        CONF_REQUEST_TIMEOUT,
+                        default=config_entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_TIMEOUT),
+                        description="Deadline for a single hub request in seconds (1-60)",
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=60.0)),
+                    vol.Optional(
+                        CONF_HEDGE_DELAY,
+                        default=config_entry.options.get(CONF_HEDGE_DELAY, DEFAULT_HEDGE_DELAY),
+                        description="Resend a slow trigger log poll after this many seconds, 0 disables (0-30)",
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=30.0)),
+                    vol.Optional(
+                        CONF_OFFLOAD_PARSING,
+                        default=config_entry.options.get(CONF_OFFLOAD_PARSING, False),
+                        description="Parse hub responses in the executor instead of the event loop",
+                    ): bool,
+                    vol.Optional(
+                        CONF_SLOW_STEP_THRESHOLD,
+                        default=config_entry.options.get(
+                            CONF_SLOW_STEP_THRESHOLD, DEFAULT_SLOW_STEP_THRESHOLD
+                        ),
+                        description="Warn when a hub call blocks the event loop longer than this many seconds (0.001-1)",
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.001, max=1.0)),
                 }
             ),
             errors=errors,
@@ -3,4 +3,31 @@ DEFAULT_TIMEOUT = 10
 CONF_HOST = "host"
 CONF_EVENT_POLL_INTERVAL = "event_poll_interval"
 DEFAULT_EVENT_POLL_INTERVAL = 1.0
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_HEDGE_DELAY = "hedge_delay"
+DEFAULT_HEDGE_DELAY = 1.0
+CONF_OFFLOAD_PARSING = "offload_parsing"
+CONF_SLOW_STEP_THRESHOLD = "slow_step_threshold"
+# Same order of magnitude as asyncio's slow callback warning in debug mode.
+DEFAULT_SLOW_STEP_THRESHOLD = 0.05
 
+CONF_DEVICE_PROFILES = "device_profiles"
+CONF_DEVICE_ID = "device_id"
+CONF_PROFILE = "profile"
+CONF_SENSOR_POLL_INTERVAL = "sensor_poll_interval"
+DEFAULT_SENSOR_POLL_INTERVAL = 60
+
+PROFILE_REALTIME = "realtime"
+PROFILE_NORMAL = "normal"
+PROFILE_LOW_POWER = "low_power"
+PROFILE_BATTERY_ONLY = "battery_only"
+PROFILE_CUSTOM = "custom"
+PROFILES = (PROFILE_REALTIME, PROFILE_NORMAL, PROFILE_LOW_POWER, PROFILE_BATTERY_ONLY, PROFILE_CUSTOM)
+
+DATA_VALIDATED_SESSIONS = f"{DOMAIN}_validated_sessions"
+VALIDATED_SESSION_TTL = 60
+DATA_PROFILER = f"{DOMAIN}_profiler"
+
+SIGNAL_BUTTON_EVENT = f"{DOMAIN}_button_event_{{}}_{{}}"
+
+TRIGGER_TYPES = ("single_click", "double_click", "rotate_left", "rotate_right")
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.device_automation.exceptions import (
+    InvalidDeviceAutomationConfig,
+)
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DOMAIN, SIGNAL_BUTTON_EVENT, TRIGGER_TYPES
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+    }
+)
+
+
+def _get_tapo_device_id(hass: HomeAssistant, device_id: str) -> str | None:
+    """Map a Home Assistant device id to the hub's child device id."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None:
+        return None
+    for domain, identifier in device.identifiers:
+        if domain == DOMAIN:
+            return identifier
+    return None
+
+
+async def async_validate_trigger_config(
+    hass: HomeAssistant, config: ConfigType
+) -> ConfigType:
+    config = TRIGGER_SCHEMA(config)
+    if _get_tapo_device_id(hass, config[CONF_DEVICE_ID]) is None:
+        raise InvalidDeviceAutomationConfig(
+            f"Device {config[CONF_DEVICE_ID]} is not a Tapo button"
+        )
+    return config
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
+    if _get_tapo_device_id(hass, device_id) is None:
+        return []
+
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Listen only on the dispatcher signal for this device and event type.
+
+    Button coordinators send one signal per (device, event type), so a press only
+    wakes the triggers registered for it instead of every Tapo automation.
+    """
+    tapo_device_id = _get_tapo_device_id(hass, config[CONF_DEVICE_ID])
+    trigger_type = config[CONF_TYPE]
+    trigger_data = trigger_info["trigger_data"]
+    job = HassJob(action, f"tapo device trigger {trigger_type}")
+
+    @callback
+    def _handle_event(event_data: dict[str, Any]) -> None:
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                    CONF_TYPE: trigger_type,
+                    "event": event_data,
+                    "description": f"Tapo {trigger_type.replace('_', ' ')}",
+                }
+            },
+        )
+
+    return async_dispatcher_connect(
+        hass, SIGNAL_BUTTON_EVENT.format(tapo_device_id, trigger_type), _handle_event
+    )
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .api import TapoAPI
+from .const import DOMAIN
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    api: TapoAPI = entry_data["api"]
+    event_poller = entry_data.get("event_poller")
+    watchdog = event_poller.watchdog if event_poller is not None else None
+    dial_manager = entry_data.get("dial_manager")
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "requests": {
+            "timeouts": api.get_timeout_count(),
+            "hedged_requests": api.get_hedged_request_count(),
+            "recovery_steps": api.get_recovery_counts(),
+        },
+        "event_loop": api.get_loop_stats(),
+        "polling": watchdog.get_status() if watchdog is not None else None,
+        "dials": dial_manager.get_stats() if dial_manager is not None else None,
+    }
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import TapoAPI
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+CONF_ENTITY_ID = "entity_id"
+CONF_DEGREES_PER_STEP = "degrees_per_step"
+CONF_STEP = "step"
+CONF_MIN_INTERVAL = "min_interval"
+
+DEFAULT_DEGREES_PER_STEP = 30
+DEFAULT_STEP = 10
+DEFAULT_MIN_INTERVAL = 0.15
+
+# Rotations further apart than this start from the entity's current state again.
+GESTURE_TIMEOUT = 2.0
+
+SUPPORTED_DOMAINS = ("light", "media_player")
+
+
+def get_dial_bindings_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, dict[str, Any]]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.dial_bindings.{entry_id}")
+
+
+class TapoDialMapper:
+    """Turn rotation events of one S200 into rate-limited commands for one entity.
+
+    Rotation degrees are accumulated into an absolute target (brightness or volume
+    percentage). At most one command is sent per min_interval and it always carries
+    the latest target, so spinning the dial quickly sends a few commands instead of
+    one per rotation event.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: TapoAPI,
+        device_id: str,
+        entity_id: str,
+        degrees_per_step: float = DEFAULT_DEGREES_PER_STEP,
+        step: float = DEFAULT_STEP,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+    ) -> None:
+        self.hass = hass
+        self.api = api
+        self.device_id = device_id
+        self.entity_id = entity_id
+        self.degrees_per_step = degrees_per_step
+        self.step = step
+        self.min_interval = min_interval
+        self.commands_sent = 0
+        self.events_received = 0
+        self._target: float | None = None
+        self._last_rotation = 0.0
+        self._last_command = 0.0
+        self._pending_flush: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._subscription = None
+
+    @callback
+    def async_start(self) -> None:
+        self._subscription = self.api.subscribe(self.device_id)
+        self._task = self.hass.async_create_background_task(
+            self._async_consume(), f"{DOMAIN} dial mapper {self.device_id}"
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        if self._pending_flush is not None:
+            self._pending_flush.cancel()
+            self._pending_flush = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            CONF_ENTITY_ID: self.entity_id,
+            CONF_DEGREES_PER_STEP: self.degrees_per_step,
+            CONF_STEP: self.step,
+            CONF_MIN_INTERVAL: self.min_interval,
+        }
+
+    async def _async_consume(self) -> None:
+        async for event in self._subscription:
+            degrees = event.get("rotation_degrees")
+            direction = event.get("direction")
+            if degrees is None or direction not in ("left", "right"):
+                continue
+            self.events_received += 1
+            self._handle_rotation(degrees if direction == "right" else -degrees)
+
+    def _current_value(self) -> float:
+        """Current brightness or volume of the target entity, in percent."""
+        state = self.hass.states.get(self.entity_id)
+        if state is None:
+            return 0.0
+        if self.entity_id.startswith("media_player."):
+            volume = state.attributes.get("volume_level")
+            return volume * 100 if volume is not None else 0.0
+        if state.state != "on":
+            return 0.0
+        brightness = state.attributes.get("brightness")
+        return brightness / 255 * 100 if brightness is not None else 0.0
+
+    @callback
+    def _handle_rotation(self, degrees: float) -> None:
+        now = time.monotonic()
+        if self._target is None or now - self._last_rotation > GESTURE_TIMEOUT:
+            self._target = self._current_value()
+        self._last_rotation = now
+        self._target = min(100.0, max(0.0, self._target + degrees / self.degrees_per_step * self.step))
+
+        if self._pending_flush is not None:
+            return
+        wait = self.min_interval - (now - self._last_command)
+        if wait <= 0:
+            self._flush()
+        else:
+            self._pending_flush = self.hass.loop.call_later(wait, self._flush)
+
+    @callback
+    def _flush(self) -> None:
+        self._pending_flush = None
+        if self._target is None:
+            return
+        self._last_command = time.monotonic()
+        self.commands_sent += 1
+
+        if self.entity_id.startswith("media_player."):
+            domain, service = "media_player", "volume_set"
+            data = {"volume_level": round(self._target / 100, 3)}
+        elif self._target <= 0:
+            domain, service, data = "light", "turn_off", {}
+        else:
+            domain, service = "light", "turn_on"
+            data = {"brightness_pct": round(self._target)}
+
+        self.hass.async_create_task(
+            self.hass.services.async_call(
+                domain, service, {"entity_id": self.entity_id, **data}, blocking=False
+            )
+        )
+
+
+class TapoDialManager:
+    """Persisted dial bindings of one config entry and their running mappers."""
+
+    def __init__(self, hass: HomeAssistant, api: TapoAPI, entry_id: str, device_ids: list[str]) -> None:
+        self.hass = hass
+        self.api = api
+        self.device_ids = device_ids
+        self._store = get_dial_bindings_store(hass, entry_id)
+        self._mappers: dict[str, TapoDialMapper] = {}
+        # Bindings of devices the hub did not report; kept so they survive saves.
+        self._unresolved: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        bindings = await self._store.async_load() or {}
+        for device_id, binding in bindings.items():
+            if device_id in self.device_ids:
+                self._start(device_id, binding)
+            else:
+                _LOGGER.debug("Dial binding of missing device %s kept until it returns", device_id)
+                self._unresolved[device_id] = binding
+
+    @callback
+    def async_stop(self) -> None:
+        for mapper in self._mappers.values():
+            mapper.async_stop()
+        self._mappers = {}
+
+    async def async_bind(self, device_id: str, binding: dict[str, Any]) -> None:
+        self._unresolved.pop(device_id, None)
+        if (mapper := self._mappers.pop(device_id, None)) is not None:
+            mapper.async_stop()
+        self._start(device_id, binding)
+        await self._async_save()
+
+    async def async_unbind(self, device_id: str) -> bool:
+        mapper = self._mappers.pop(device_id, None)
+        if mapper is None and self._unresolved.pop(device_id, None) is None:
+            return False
+        if mapper is not None:
+            mapper.async_stop()
+        await self._async_save()
+        return True
+
+    def get_mapper(self, device_id: str) -> TapoDialMapper | None:
+        return self._mappers.get(device_id)
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Rotation events received and commands sent per bound dial."""
+        return {
+            device_id: {
+                CONF_ENTITY_ID: mapper.entity_id,
+                "events_received": mapper.events_received,
+                "commands_sent": mapper.commands_sent,
+            }
+            for device_id, mapper in self._mappers.items()
+        }
+
+    def _start(self, device_id: str, binding: dict[str, Any]) -> None:
+        mapper = TapoDialMapper(
+            self.hass,
+            self.api,
+            device_id,
+            binding[CONF_ENTITY_ID],
+            degrees_per_step=binding.get(CONF_DEGREES_PER_STEP, DEFAULT_DEGREES_PER_STEP),
+            step=binding.get(CONF_STEP, DEFAULT_STEP),
+            min_interval=binding.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+        )
+        mapper.async_start()
+        self._mappers[device_id] = mapper
+        _LOGGER.debug("Dial of device %s bound to %s", device_id, mapper.entity_id)
+
+    async def _async_save(self) -> None:
+        await self._store.async_save(
+            {
+                **self._unresolved,
+                **{device_id: mapper.as_dict() for device_id, mapper in self._mappers.items()},
+            }
+        )
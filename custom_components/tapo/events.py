@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_CLOSE = "close"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_CLOSE)
+
+DEFAULT_QUEUE_SIZE = 100
+
+_CLOSED = object()
+
+
+class TapoEventSubscription:
+    """Async iterator over button events, fed from the shared poll stream.
+
+    Each subscription has its own bounded queue, so a slow consumer never blocks
+    polling or other subscribers. When the queue is full the overflow policy decides
+    whether the oldest event is dropped, the new event is dropped, or the
+    subscription is closed.
+    """
+
+    def __init__(
+        self,
+        stream: TapoEventStream,
+        device_id: str | None,
+        maxsize: int,
+        overflow: str,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.device_id = device_id
+        self.overflow = overflow
+        self.dropped = 0
+        self._stream = stream
+        # One extra slot so the close marker always fits.
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize + 1)
+        self._maxsize = maxsize
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _put(self, event: dict[str, Any]) -> None:
+        if self._closed:
+            return
+        if self._queue.qsize() >= self._maxsize:
+            self.dropped += 1
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                return
+            if self.overflow == OVERFLOW_CLOSE:
+                _LOGGER.warning(
+                    "Event subscriber for %s fell behind by %d events, closing it",
+                    self.device_id or "all devices",
+                    self._maxsize,
+                )
+                self.close()
+                return
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._stream._remove(self)
+        self._queue.put_nowait(_CLOSED)
+
+    def __aiter__(self) -> TapoEventSubscription:
+        return self
+
+    async def __anext__(self) -> dict[str, Any]:
+        event = await self._queue.get()
+        if event is _CLOSED:
+            raise StopAsyncIteration
+        return event
+
+    async def __aenter__(self) -> TapoEventSubscription:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class TapoEventStream:
+    """Fan out button events to subscribers, indexed by device id."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str | None, set[TapoEventSubscription]] = {}
+
+    def subscribe(
+        self,
+        device_id: str | None = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+    ) -> TapoEventSubscription:
+        """Subscribe to events of one device, or of every device if device_id is None."""
+        subscription = TapoEventSubscription(self, device_id, maxsize, overflow)
+        self._subscribers.setdefault(device_id, set()).add(subscription)
+        return subscription
+
+    def publish(self, device_id: str, event: dict[str, Any]) -> None:
+        for key in (device_id, None):
+            for subscription in list(self._subscribers.get(key, ())):
+                subscription._put(event)
+
+    def close(self) -> None:
+        for subscriptions in list(self._subscribers.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+
+    def _remove(self, subscription: TapoEventSubscription) -> None:
+        subscriptions = self._subscribers.get(subscription.device_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.device_id]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from .api import TapoAPI
+from .button import build_event_data
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_BACKFILL_PROGRESS = f"{DOMAIN}_backfill_progress"
+
+HISTORY_DIRECTORY = "tapo_history"
+DEFAULT_HISTORY_PAGE_SIZE = 50
+BACKFILL_CONCURRENCY = 2
+# Entries are written and progress is reported every this many entries.
+WRITE_CHUNK_SIZE = 200
+
+
+def _append_lines(path: Path, lines: list[str], truncate: bool) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w" if truncate else "a", encoding="utf-8") as file:
+        file.writelines(lines)
+
+
+async def async_backfill_device(
+    hass: HomeAssistant,
+    api: TapoAPI,
+    device_id: str,
+    semaphore: asyncio.Semaphore,
+    page_size: int = DEFAULT_HISTORY_PAGE_SIZE,
+) -> int:
+    """Stream a device's hub-side trigger history to a JSON lines file.
+
+    Entries are converted to the tapo_button_pressed event format and written in
+    chunks from the executor, so memory use does not grow with the history length.
+    """
+    path = Path(hass.config.path(HISTORY_DIRECTORY, f"{device_id}.jsonl"))
+    count = 0
+    chunk: list[str] = []
+    truncate = True
+
+    async def _flush(done: bool) -> None:
+        nonlocal chunk, truncate
+        await hass.async_add_executor_job(_append_lines, path, chunk, truncate)
+        chunk = []
+        truncate = False
+        hass.bus.async_fire(
+            EVENT_BACKFILL_PROGRESS,
+            {"device_id": device_id, "entries": count, "done": done, "path": str(path)},
+        )
+
+    async with semaphore:
+        _LOGGER.info("Backfilling trigger history of device %s to %s", device_id, path)
+        async for log in api.async_iter_trigger_history(device_id, page_size=page_size):
+            chunk.append(json.dumps(build_event_data(device_id, log)) + "\n")
+            count += 1
+            if len(chunk) >= WRITE_CHUNK_SIZE:
+                await _flush(False)
+        await _flush(True)
+
+    _LOGGER.info("Backfilled %d trigger log entries of device %s", count, device_id)
+    return count
+
+
+async def async_backfill_history(
+    hass: HomeAssistant,
+    targets: list[tuple[TapoAPI, str]],
+    page_size: int = DEFAULT_HISTORY_PAGE_SIZE,
+) -> dict[str, int | None]:
+    """Backfill several devices with at most BACKFILL_CONCURRENCY running at once."""
+    semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+    results = await asyncio.gather(
+        *(
+            async_backfill_device(hass, api, device_id, semaphore, page_size)
+            for api, device_id in targets
+        ),
+        return_exceptions=True,
+    )
+
+    counts: dict[str, int | None] = {}
+    for (_, device_id), result in zip(targets, results):
+        if isinstance(result, Exception):
+            _LOGGER.error("Backfilling trigger history of device %s failed: %s", device_id, result)
+            hass.bus.async_fire(
+                EVENT_BACKFILL_PROGRESS,
+                {"device_id": device_id, "done": True, "error": str(result)},
+            )
+            counts[device_id] = None
+        else:
+            counts[device_id] = result
+    return counts
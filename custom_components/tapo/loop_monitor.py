@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Coroutine, Generator
+import contextvars
+import functools
+import logging
+import time
+import types
+from typing import Any, TypeVar
+
+from .const import DEFAULT_SLOW_STEP_THRESHOLD
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_measuring: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "tapo_loop_monitor_measuring", default=False
+)
+
+
+class OperationStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.slow_calls = 0
+        self.total_blocking = 0.0
+        self.max_blocking = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "slow_calls": self.slow_calls,
+            "total_blocking_ms": round(self.total_blocking * 1000, 2),
+            "max_blocking_ms": round(self.max_blocking * 1000, 2),
+        }
+
+
+@types.coroutine
+def _drive_timed(
+    coro: Coroutine[Any, Any, _T], steps: list[float]
+) -> Generator[Any, Any, _T]:
+    """Run a coroutine, recording the time spent in each synchronous step.
+
+    Every resume of the coroutine runs on the event loop until its next await, so
+    the duration of each send()/throw() is exactly the time it blocked the loop.
+    """
+    value: Any = None
+    error: BaseException | None = None
+    while True:
+        start = time.perf_counter()
+        try:
+            if error is not None:
+                yielded = coro.throw(error)
+            else:
+                yielded = coro.send(value)
+        except StopIteration as stop:
+            steps.append(time.perf_counter() - start)
+            return stop.value
+        except BaseException:
+            steps.append(time.perf_counter() - start)
+            raise
+        steps.append(time.perf_counter() - start)
+
+        try:
+            value = yield yielded
+            error = None
+        except BaseException as err:
+            value = None
+            error = err
+
+
+class LoopMonitor:
+    """Measure how long TapoAPI calls block the event loop synchronously.
+
+    Only the wall time between awaits is counted, not time spent waiting on the
+    network. Nested instrumented calls are folded into the outermost one.
+    """
+
+    def __init__(self, slow_step_threshold: float = DEFAULT_SLOW_STEP_THRESHOLD) -> None:
+        self.slow_step_threshold = slow_step_threshold
+        self._stats: dict[str, OperationStats] = {}
+
+    async def async_measure(self, operation: str, coro: Coroutine[Any, Any, _T]) -> _T:
+        if _measuring.get():
+            return await coro
+
+        steps: list[float] = []
+        token = _measuring.set(True)
+        try:
+            return await _drive_timed(coro, steps)
+        finally:
+            _measuring.reset(token)
+            self._record(operation, steps)
+
+    def _record(self, operation: str, steps: list[float]) -> None:
+        stats = self._stats.get(operation)
+        if stats is None:
+            stats = self._stats[operation] = OperationStats()
+
+        longest = max(steps, default=0.0)
+        stats.calls += 1
+        stats.total_blocking += sum(steps)
+        stats.max_blocking = max(stats.max_blocking, longest)
+
+        if longest > self.slow_step_threshold:
+            stats.slow_calls += 1
+            # Warn once per operation; later occurrences only go to debug.
+            log = _LOGGER.warning if stats.slow_calls == 1 else _LOGGER.debug
+            log(
+                "%s blocked the event loop for %.1f ms (threshold %.1f ms)",
+                operation,
+                longest * 1000,
+                self.slow_step_threshold * 1000,
+            )
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        return {operation: stats.as_dict() for operation, stats in self._stats.items()}
+
+
+def instrumented(
+    func: Callable[..., Coroutine[Any, Any, _T]],
+) -> Callable[..., Awaitable[_T]]:
+    """Measure a TapoAPI coroutine method with the instance's loop monitor."""
+
+    @functools.wraps(func)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> _T:
+        return await self.loop_monitor.async_measure(func.__name__, func(self, *args, **kwargs))
+
+    return wrapper
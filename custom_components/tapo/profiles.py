@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+
+from .const import (
+    CONF_DEVICE_PROFILES,
+    CONF_EVENT_POLL_INTERVAL,
+    CONF_PROFILE,
+    CONF_SENSOR_POLL_INTERVAL,
+    DEFAULT_EVENT_POLL_INTERVAL,
+    DEFAULT_SENSOR_POLL_INTERVAL,
+    PROFILE_BATTERY_ONLY,
+    PROFILE_CUSTOM,
+    PROFILE_LOW_POWER,
+    PROFILE_NORMAL,
+    PROFILE_REALTIME,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PollingProfile:
+    """How often one device is polled.
+
+    event_interval is None when trigger logs are not polled at all.
+    """
+
+    event_interval: float | None
+    sensor_interval: float
+
+
+# The normal profile's event interval comes from the entry-wide option.
+PRESET_PROFILES: dict[str, PollingProfile] = {
+    PROFILE_REALTIME: PollingProfile(event_interval=0.5, sensor_interval=30),
+    PROFILE_LOW_POWER: PollingProfile(event_interval=5.0, sensor_interval=300),
+    PROFILE_BATTERY_ONLY: PollingProfile(event_interval=None, sensor_interval=900),
+}
+
+
+def get_event_poll_interval(entry: ConfigEntry) -> float:
+    return (
+        entry.options.get(CONF_EVENT_POLL_INTERVAL)
+        or entry.data.get(CONF_EVENT_POLL_INTERVAL)
+        or DEFAULT_EVENT_POLL_INTERVAL
+    )
+
+
+def resolve_profile(entry: ConfigEntry, device_id: str) -> PollingProfile:
+    normal = PollingProfile(get_event_poll_interval(entry), DEFAULT_SENSOR_POLL_INTERVAL)
+    settings: Mapping[str, Any] = entry.options.get(CONF_DEVICE_PROFILES, {}).get(device_id, {})
+    profile = settings.get(CONF_PROFILE, PROFILE_NORMAL)
+
+    if profile == PROFILE_CUSTOM:
+        return PollingProfile(
+            event_interval=settings.get(CONF_EVENT_POLL_INTERVAL, normal.event_interval),
+            sensor_interval=settings.get(CONF_SENSOR_POLL_INTERVAL, normal.sensor_interval),
+        )
+    return PRESET_PROFILES.get(profile, normal)
+
+
+def async_apply_device_profiles(entry: ConfigEntry, entry_data: dict[str, Any]) -> None:
+    """Apply the entry's per-device profiles to the running pollers."""
+    event_poller = entry_data.get("event_poller")
+    sensor_coordinators = entry_data.get("sensor_coordinators", {})
+
+    for device_id, coordinator in sensor_coordinators.items():
+        profile = resolve_profile(entry, device_id)
+        _LOGGER.debug("Polling profile of device %s: %s", device_id, profile)
+        coordinator.set_poll_interval(profile.sensor_interval)
+        if event_poller is not None:
+            event_poller.set_device_interval(device_id, profile.event_interval)
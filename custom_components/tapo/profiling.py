@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime
+import json
+import logging
+from pathlib import Path
+import sys
+import threading
+from types import FrameType
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .loop_monitor import _drive_timed
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_PROFILE_COMPLETE = f"{DOMAIN}_profile_complete"
+
+PROFILE_DIRECTORY = "tapo_profiles"
+DEFAULT_PROFILE_DURATION = 60
+MAX_PROFILE_DURATION = 600
+DEFAULT_SAMPLE_INTERVAL = 0.01
+MIN_SAMPLE_INTERVAL = 0.005
+# Walking every task runs on the event loop, so tasks are sampled far less often
+# than the loop thread's stack, which is sampled from the profiler thread.
+TASK_SAMPLE_INTERVAL = 0.2
+SUMMARY_TOP_FUNCTIONS = 10
+
+_PACKAGE_PATH = str(Path(__file__).parent)
+
+RUNNING = "running"
+WAITING = "waiting"
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _is_own_frame(frame: FrameType) -> bool:
+    filename = frame.f_code.co_filename
+    return filename.startswith(_PACKAGE_PATH) and filename != __file__
+
+
+def _thread_stack(frame: FrameType | None) -> tuple[str, ...]:
+    """Integration frames of a running thread, outermost first."""
+    stack = []
+    while frame is not None:
+        if _is_own_frame(frame):
+            stack.append(_frame_name(frame))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def _task_stack(task: asyncio.Task[Any]) -> tuple[str, ...]:
+    """Integration frames of a suspended task, following its await chain."""
+    stack = []
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        if frame.f_code is _drive_timed.__code__:
+            # The loop monitor drives the measured coroutine by hand, so the
+            # await chain continues in its local variable instead of cr_await.
+            awaitable = frame.f_locals.get("coro")
+            continue
+        if _is_own_frame(frame):
+            stack.append(_frame_name(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return tuple(stack)
+
+
+class TapoProfiler:
+    """Sample where the integration spends its time for a bounded duration.
+
+    A background thread samples the event loop thread's stack, which shows the
+    integration code that is running on the loop. A loop timer samples the
+    suspended tasks every TASK_SAMPLE_INTERVAL seconds, which shows what the
+    integration is waiting on. Nothing is sampled while no profile is running.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._samples: Counter[tuple[str, ...]] = Counter()
+        self._sample_count = 0
+        self._task_sample_count = 0
+        self._interval = DEFAULT_SAMPLE_INTERVAL
+        self._task_interval = TASK_SAMPLE_INTERVAL
+        self._started: datetime | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._unsub_task_sample: asyncio.TimerHandle | None = None
+        self._unsub_deadline: asyncio.TimerHandle | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @callback
+    def async_start(
+        self,
+        duration: float = DEFAULT_PROFILE_DURATION,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ) -> None:
+        if self.running:
+            raise RuntimeError("A profile is already running")
+
+        self._samples = Counter()
+        self._sample_count = 0
+        self._task_sample_count = 0
+        self._interval = max(interval, MIN_SAMPLE_INTERVAL)
+        self._task_interval = max(self._interval, TASK_SAMPLE_INTERVAL)
+        self._started = datetime.now()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop_thread,
+            args=(threading.get_ident(),),
+            name=f"{DOMAIN}_profiler",
+            daemon=True,
+        )
+        self._thread.start()
+        self._unsub_task_sample = self.hass.loop.call_later(
+            self._task_interval, self._sample_tasks
+        )
+        self._unsub_deadline = self.hass.loop.call_later(
+            duration,
+            lambda: self.hass.async_create_task(self.async_stop()),
+        )
+        _LOGGER.info(
+            "Profiling started for %ss, sampling the loop every %s s and tasks every %s s",
+            duration,
+            self._interval,
+            self._task_interval,
+        )
+
+    async def async_stop(self) -> dict[str, Any] | None:
+        """Stop sampling, write the profile files and return the summary."""
+        if (thread := self._thread) is None:
+            return None
+
+        self._thread = None
+        self._stop_event.set()
+        for handle in (self._unsub_task_sample, self._unsub_deadline):
+            if handle is not None:
+                handle.cancel()
+        self._unsub_task_sample = self._unsub_deadline = None
+        await self.hass.async_add_executor_job(thread.join)
+
+        summary = self._summarize()
+        base = Path(
+            self.hass.config.path(PROFILE_DIRECTORY, f"profile_{self._started:%Y%m%d_%H%M%S}")
+        )
+        await self.hass.async_add_executor_job(self._write, base, self._samples.copy(), summary)
+        summary["profile_path"] = f"{base}.folded"
+        summary["summary_path"] = f"{base}.json"
+
+        _LOGGER.info(
+            "Profiling finished with %d samples, written to %s.folded", self._sample_count, base
+        )
+        for function, counts in list(summary["functions"].items())[:SUMMARY_TOP_FUNCTIONS]:
+            _LOGGER.info("  %s: %s", function, counts)
+        self.hass.bus.async_fire(
+            EVENT_PROFILE_COMPLETE,
+            {"profile_path": summary["profile_path"], "summary_path": summary["summary_path"]},
+        )
+        return summary
+
+    def _record(self, kind: str, stack: tuple[str, ...]) -> None:
+        with self._lock:
+            self._samples[(kind, *stack)] += 1
+
+    def _sample_loop_thread(self, loop_thread_id: int) -> None:
+        while not self._stop_event.wait(self._interval):
+            self._sample_count += 1
+            frame = sys._current_frames().get(loop_thread_id)
+            if stack := _thread_stack(frame):
+                self._record(RUNNING, stack)
+
+    @callback
+    def _sample_tasks(self) -> None:
+        self._task_sample_count += 1
+        for task in asyncio.all_tasks(self.hass.loop):
+            if task is asyncio.current_task(self.hass.loop):
+                continue
+            if stack := _task_stack(task):
+                self._record(WAITING, stack)
+        self._unsub_task_sample = self.hass.loop.call_later(
+            self._task_interval, self._sample_tasks
+        )
+
+    def _summarize(self) -> dict[str, Any]:
+        """Per function sample counts; total includes callees, self only the leaf."""
+        functions: dict[str, Counter[str]] = {}
+        with self._lock:
+            samples = list(self._samples.items())
+        for (kind, *stack), count in samples:
+            for function in set(stack):
+                functions.setdefault(function, Counter())[f"{kind}_total"] += count
+            functions.setdefault(stack[-1], Counter())[f"{kind}_self"] += count
+
+        ordered = sorted(
+            functions.items(),
+            key=lambda item: (item[1][f"{RUNNING}_total"], item[1][f"{WAITING}_total"]),
+            reverse=True,
+        )
+        return {
+            "started": self._started.isoformat() if self._started else None,
+            "interval": self._interval,
+            "loop_samples": self._sample_count,
+            "task_interval": self._task_interval,
+            "task_samples": self._task_sample_count,
+            "functions": {function: dict(counts) for function, counts in ordered},
+        }
+
+    @staticmethod
+    def _write(base: Path, samples: Counter[tuple[str, ...]], summary: dict[str, Any]) -> None:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        # Collapsed stack format, readable by flamegraph.pl and speedscope.
+        with base.with_suffix(".folded").open("w", encoding="utf-8") as file:
+            for stack, count in samples.most_common():
+                file.write(f"{';'.join(stack)} {count}\n")
+        with base.with_suffix(".json").open("w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
@@ -7,18 +7,38 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import PlatformNotReady
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
 
-from .api import TapoAPI
-from .const import CONF_EVENT_POLL_INTERVAL, DEFAULT_EVENT_POLL_INTERVAL, DOMAIN
+from .api import TapoAPI, TapoTimeoutError
+from .button import TapoButtonCoordinator, TapoButtonSensor, TapoEventPoller
+from .const import DEFAULT_SENSOR_POLL_INTERVAL, DOMAIN
+from .profiles import get_event_poll_interval, resolve_profile
+from .statistics import TapoDeviceStatistics
+from .watchdog import TapoPollWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
+# Device coordinators of the same hub share one child list response this fresh.
+SENSOR_DATA_MAX_AGE = 5.0
+# With debug logging on, the full sensor data is logged only every this many updates.
+PAYLOAD_LOG_EVERY = 10
+
+BATTERY_DRAIN_STORAGE_VERSION = 1
+BATTERY_DRAIN_SAVE_DELAY = 60
+
+
+def get_battery_drain_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Battery discharge segments of an entry's devices, kept across restarts."""
+    return Store(hass, BATTERY_DRAIN_STORAGE_VERSION, f"{DOMAIN}.battery_drain.{entry_id}")
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -28,7 +48,10 @@ async def async_setup_entry(
     entry_data = hass.data[DOMAIN][entry.entry_id]
     api: TapoAPI = entry_data["api"]
 
-    all_devices = await api.async_get_all_child_devices()
+    try:
+        all_devices = await api.async_get_all_child_devices()
+    except TapoTimeoutError as err:
+        raise PlatformNotReady(f"Timed out listing child devices: {err}") from err
     if not all_devices:
         _LOGGER.warning("No child devices found")
         return
@@ -36,6 +59,28 @@ async def async_setup_entry(
     _LOGGER.info("Found %d S200B device(s)", len(all_devices))
     
     sensors = []
+    sensor_coordinators: dict[str, TapoCoordinator] = {}
+    
+    drain_store = get_battery_drain_store(hass, entry.entry_id)
+    drain_states: dict[str, Any] = await drain_store.async_load() or {}
+
+    @callback
+    def _async_save_battery_drain() -> None:
+        drain_store.async_delay_save(
+            lambda: {
+                **drain_states,
+                **{
+                    device_id: coordinator.statistics.battery_drain.as_dict()
+                    for device_id, coordinator in sensor_coordinators.items()
+                },
+            },
+            BATTERY_DRAIN_SAVE_DELAY,
+        )
+    
+    poll_interval = get_event_poll_interval(entry)
+    event_poller = TapoEventPoller(
+        hass, api, poll_interval, watchdog=TapoPollWatchdog(hass, api, entry.entry_id)
+    )
     
     for device_data in all_devices:
         device_id = device_data.get("device_id")
@@ -47,8 +92,13 @@ async def async_setup_entry(
         
         _LOGGER.debug("Setting up sensors for device %s (%s)", device_id, device_nickname)
         
-        coordinator = TapoCoordinator(hass, api, device_id)
+        profile = resolve_profile(entry, device_id)
+        coordinator = TapoCoordinator(hass, api, device_id, poll_interval=profile.sensor_interval)
+        if device_id in drain_states:
+            coordinator.statistics.battery_drain.restore(drain_states[device_id])
         await coordinator.async_config_entry_first_refresh()
+        sensor_coordinators[device_id] = coordinator
+        entry.async_on_unload(coordinator.async_add_listener(_async_save_battery_drain))
 
         sensors_data = coordinator.data or {}
         _LOGGER.debug("Sensor setup for device %s: sensors data = %s", device_id, sensors_data)
@@ -197,41 +247,125 @@ async def async_setup_entry(
                     )
                 )
             
-            from .button import TapoButtonCoordinator, TapoButtonSensor
-            poll_interval = entry.options.get(CONF_EVENT_POLL_INTERVAL) or entry.data.get(CONF_EVENT_POLL_INTERVAL, DEFAULT_EVENT_POLL_INTERVAL)
-            button_coordinator = TapoButtonCoordinator(hass, api, device_id, poll_interval=poll_interval)
+            if "battery_drain_rate" in sensors_data:
+                sensors.append(
+                    TapoStatisticSensor(
+                        coordinator,
+                        entry.entry_id,
+                        device_id,
+                        "battery_drain_rate",
+                        f"{device_nickname} Battery Drain Rate",
+                        "%/d",
+                        SensorStateClass.MEASUREMENT,
+                    )
+                )
+
+            if "battery_days_remaining" in sensors_data:
+                sensors.append(
+                    TapoStatisticSensor(
+                        coordinator,
+                        entry.entry_id,
+                        device_id,
+                        "battery_days_remaining",
+                        f"{device_nickname} Battery Days Remaining",
+                        "d",
+                        SensorStateClass.MEASUREMENT,
+                    )
+                )
+
+            if "rssi_average" in sensors_data:
+                sensors.append(
+                    TapoStatisticSensor(
+                        coordinator,
+                        entry.entry_id,
+                        device_id,
+                        "rssi_average",
+                        f"{device_nickname} Signal Strength Average",
+                        "dBm",
+                        SensorStateClass.MEASUREMENT,
+                    )
+                )
+
+            if "signal_level_average" in sensors_data:
+                sensors.append(
+                    TapoStatisticSensor(
+                        coordinator,
+                        entry.entry_id,
+                        device_id,
+                        "signal_level_average",
+                        f"{device_nickname} Signal Level Average",
+                        None,
+                        SensorStateClass.MEASUREMENT,
+                    )
+                )
+            
+            button_coordinator = TapoButtonCoordinator(
+                hass, api, device_id, poll_interval=profile.event_interval
+            )
             await button_coordinator.async_config_entry_first_refresh()
+            event_poller.add_coordinator(button_coordinator)
             sensors.append(TapoButtonSensor(button_coordinator, entry.entry_id, device_id, device_nickname))
 
     _LOGGER.info("Setting up %d sensor entities", len(sensors))
     async_add_entities(sensors)
 
+    event_poller.async_start()
+    entry.async_on_unload(event_poller.async_stop)
+    entry_data["event_poller"] = event_poller
+    entry_data["sensor_coordinators"] = sensor_coordinators
+
 
 class TapoCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, api: TapoAPI, device_id: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: TapoAPI,
+        device_id: str,
+        poll_interval: float = DEFAULT_SENSOR_POLL_INTERVAL,
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{device_id}",
-            update_interval=timedelta(seconds=60),
+            update_interval=timedelta(seconds=poll_interval),
         )
         self.api = api
         self.device_id = device_id
         self._last_successful_update_time: datetime | None = None
+        self.statistics = TapoDeviceStatistics()
+        self._updates = 0
 
     def get_last_successful_update_time(self) -> datetime | None:
         return self._last_successful_update_time
 
+    def set_poll_interval(self, poll_interval: float) -> None:
+        """Change the refresh interval, refreshing now so the new schedule starts immediately."""
+        update_interval = timedelta(seconds=poll_interval)
+        if update_interval == self.update_interval:
+            return
+        self.update_interval = update_interval
+        self.hass.async_create_task(self.async_request_refresh())
+
     async def _async_update_data(self) -> dict[str, Any]:
         _LOGGER.debug("Updating sensor coordinator data for device %s", self.device_id)
         try:
-            sensor_data = await self.api.async_get_sensor_data(device_id=self.device_id)
+            sensor_data = await self.api.async_get_sensor_data(
+                device_id=self.device_id, max_age=SENSOR_DATA_MAX_AGE
+            )
             if sensor_data is None:
                 _LOGGER.warning("Failed to get sensor data for device %s, returning empty dict", self.device_id)
                 return {}
-            _LOGGER.debug("Sensor data retrieved for device %s: %s", self.device_id, sensor_data)
+            self._updates += 1
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                if self._updates % PAYLOAD_LOG_EVERY == 1:
+                    _LOGGER.debug("Sensor data retrieved for device %s: %s", self.device_id, sensor_data)
+                else:
+                    _LOGGER.debug(
+                        "Sensor data retrieved for device %s (%d fields)", self.device_id, len(sensor_data)
+                    )
             self._last_successful_update_time = datetime.now()
-            return sensor_data
+            self.statistics.update(sensor_data, self._last_successful_update_time.timestamp())
+            return {**sensor_data, **self.statistics.as_sensor_data()}
         except asyncio.TimeoutError as err:
             _LOGGER.warning("Timeout while getting sensor data for device %s: %s", self.device_id, err)
             return {}
@@ -259,6 +393,16 @@ class TapoSensor(CoordinatorEntity, SensorEntity):
         self._attr_native_unit_of_measurement = unit
         self._attr_state_class = state_class
 
+        device_data = coordinator.data if isinstance(coordinator.data, dict) else {}
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name=device_data.get("nickname"),
+            manufacturer="TP-Link",
+            model=device_data.get("model"),
+            sw_version=device_data.get("fw_ver") or device_data.get("firmware_version"),
+            hw_version=device_data.get("hw_ver") or device_data.get("hardware_version"),
+        )
+
     @property
     def native_value(self) -> str | int | float | bool | None:
         if isinstance(self.coordinator.data, dict):
@@ -280,3 +424,14 @@ class TapoSensor(CoordinatorEntity, SensorEntity):
         
         return attrs
 
+
+class TapoStatisticSensor(TapoSensor):
+    """Sensor derived from the coordinator's incremental statistics."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        attrs = super().extra_state_attributes
+        statistics = getattr(self.coordinator, "statistics", None)
+        if statistics is not None:
+            attrs.update(statistics.get_attributes(self._sensor_key))
+        return attrs
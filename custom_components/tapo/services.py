@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DATA_PROFILER, DOMAIN
+from .dial import (
+    CONF_DEGREES_PER_STEP,
+    CONF_ENTITY_ID,
+    CONF_MIN_INTERVAL,
+    CONF_STEP,
+    DEFAULT_DEGREES_PER_STEP,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_STEP,
+    SUPPORTED_DOMAINS,
+)
+from .history import DEFAULT_HISTORY_PAGE_SIZE, async_backfill_history
+from .profiling import (
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_SAMPLE_INTERVAL,
+    MAX_PROFILE_DURATION,
+    MIN_SAMPLE_INTERVAL,
+    TapoProfiler,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BIND_DIAL = "bind_dial"
+SERVICE_UNBIND_DIAL = "unbind_dial"
+SERVICE_BACKFILL_HISTORY = "backfill_history"
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_STOP_PROFILING = "stop_profiling"
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
+
+CASSETTE_DIRECTORY = "tapo_cassettes"
+
+ATTR_PAGE_SIZE = "page_size"
+ATTR_DURATION = "duration"
+ATTR_INTERVAL = "interval"
+
+BIND_DIAL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(CONF_ENTITY_ID): vol.All(cv.entity_id, cv.entity_domain(SUPPORTED_DOMAINS)),
+        vol.Optional(CONF_DEGREES_PER_STEP, default=DEFAULT_DEGREES_PER_STEP): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=360)
+        ),
+        vol.Optional(CONF_STEP, default=DEFAULT_STEP): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=100)
+        ),
+        vol.Optional(CONF_MIN_INTERVAL, default=DEFAULT_MIN_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0.0, max=5.0)
+        ),
+    }
+)
+
+UNBIND_DIAL_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+BACKFILL_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_PAGE_SIZE, default=DEFAULT_HISTORY_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=2, max=100)
+        ),
+    }
+)
+
+START_PROFILING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_SAMPLE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=MIN_SAMPLE_INTERVAL, max=1.0)
+        ),
+    }
+)
+
+RECORDING_SCHEMA = vol.Schema({vol.Optional(ATTR_DEVICE_ID): cv.string})
+
+
+def _get_entry_data(hass: HomeAssistant, device_id: str) -> dict[str, Any]:
+    """Find the config entry whose hub owns the given child device."""
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        poller = entry_data.get("event_poller")
+        if poller is not None and device_id in poller.device_ids:
+            return entry_data
+    raise HomeAssistantError(f"Tapo device {device_id} not found")
+
+
+def _get_target_apis(hass: HomeAssistant, call: ServiceCall) -> list[Any]:
+    """API of the hub owning call's device_id, or of every hub without one."""
+    if ATTR_DEVICE_ID in call.data:
+        return [_get_entry_data(hass, call.data[ATTR_DEVICE_ID])["api"]]
+    return [entry_data["api"] for entry_data in hass.data.get(DOMAIN, {}).values()]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_BIND_DIAL):
+        return
+
+    async def async_bind_dial(call: ServiceCall) -> None:
+        device_id = call.data[ATTR_DEVICE_ID]
+        entry_data = _get_entry_data(hass, device_id)
+        await entry_data["dial_manager"].async_bind(
+            device_id,
+            {
+                CONF_ENTITY_ID: call.data[CONF_ENTITY_ID],
+                CONF_DEGREES_PER_STEP: call.data[CONF_DEGREES_PER_STEP],
+                CONF_STEP: call.data[CONF_STEP],
+                CONF_MIN_INTERVAL: call.data[CONF_MIN_INTERVAL],
+            },
+        )
+
+    async def async_unbind_dial(call: ServiceCall) -> None:
+        device_id = call.data[ATTR_DEVICE_ID]
+        entry_data = _get_entry_data(hass, device_id)
+        if not await entry_data["dial_manager"].async_unbind(device_id):
+            _LOGGER.warning("Dial of device %s is not bound", device_id)
+
+    async def async_backfill(call: ServiceCall) -> None:
+        if ATTR_DEVICE_ID in call.data:
+            device_id = call.data[ATTR_DEVICE_ID]
+            targets = [(_get_entry_data(hass, device_id)["api"], device_id)]
+        else:
+            targets = [
+                (entry_data["api"], device_id)
+                for entry_data in hass.data.get(DOMAIN, {}).values()
+                if (poller := entry_data.get("event_poller")) is not None
+                for device_id in poller.device_ids
+            ]
+        if not targets:
+            raise HomeAssistantError("No Tapo devices to backfill")
+
+        hass.async_create_background_task(
+            async_backfill_history(hass, targets, page_size=call.data[ATTR_PAGE_SIZE]),
+            f"{DOMAIN} backfill history",
+        )
+
+    async def async_start_profiling(call: ServiceCall) -> None:
+        profiler: TapoProfiler = hass.data.setdefault(DATA_PROFILER, TapoProfiler(hass))
+        if profiler.running:
+            raise HomeAssistantError("A Tapo profile is already running")
+        profiler.async_start(call.data[ATTR_DURATION], call.data[ATTR_INTERVAL])
+
+    async def async_stop_profiling(call: ServiceCall) -> None:
+        profiler: TapoProfiler | None = hass.data.get(DATA_PROFILER)
+        if profiler is None or not profiler.running:
+            raise HomeAssistantError("No Tapo profile is running")
+        await profiler.async_stop()
+
+    async def async_start_recording(call: ServiceCall) -> None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for api in _get_target_apis(hass, call):
+            if api.recording:
+                _LOGGER.warning("Hub %s is already being recorded", api.host)
+                continue
+            api.start_recording(
+                hass.config.path(CASSETTE_DIRECTORY, f"{api.host.replace(':', '_')}_{timestamp}.jsonl")
+            )
+
+    async def async_stop_recording(call: ServiceCall) -> None:
+        for api in _get_target_apis(hass, call):
+            await api.async_stop_recording()
+
+    hass.services.async_register(DOMAIN, SERVICE_BIND_DIAL, async_bind_dial, schema=BIND_DIAL_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_UNBIND_DIAL, async_unbind_dial, schema=UNBIND_DIAL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL_HISTORY, async_backfill, schema=BACKFILL_HISTORY_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_PROFILING, async_start_profiling, schema=START_PROFILING_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, SERVICE_STOP_PROFILING, async_stop_profiling)
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_RECORDING, async_start_recording, schema=RECORDING_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_RECORDING, async_stop_recording, schema=RECORDING_SCHEMA
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    if hass.data.get(DOMAIN):
+        return
+    if (profiler := hass.data.pop(DATA_PROFILER, None)) is not None and profiler.running:
+        hass.async_create_task(profiler.async_stop())
+    for service in (
+        SERVICE_BIND_DIAL,
+        SERVICE_UNBIND_DIAL,
+        SERVICE_BACKFILL_HISTORY,
+        SERVICE_START_PROFILING,
+        SERVICE_STOP_PROFILING,
+        SERVICE_START_RECORDING,
+        SERVICE_STOP_RECORDING,
+    ):
+        hass.services.async_remove(DOMAIN, service)
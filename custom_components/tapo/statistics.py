@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Any
+
+SECONDS_PER_DAY = 86400
+DEFAULT_EWMA_ALPHA = 0.1
+MIN_DRAIN_WINDOW = 3600
+# A rise of at least this many percent means the battery was replaced or charged;
+# smaller rises are reading jitter and keep the current discharge segment.
+BATTERY_REPLACED_RISE = 5
+
+
+class RunningStatistic:
+    """Exponentially weighted mean and variance with min/max, in constant memory."""
+
+    def __init__(self, alpha: float = DEFAULT_EWMA_ALPHA) -> None:
+        self.alpha = alpha
+        self.count = 0
+        self.mean: float | None = None
+        self.variance = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.last: float | None = None
+
+    def add(self, value: float) -> None:
+        if self.mean is None:
+            self.mean = float(value)
+            self.minimum = self.maximum = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+            self.minimum = min(self.minimum, value)
+            self.maximum = max(self.maximum, value)
+        self.last = value
+        self.count += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "average": round(self.mean, 2) if self.mean is not None else None,
+            "variance": round(self.variance, 2) if self.count else None,
+            "min": self.minimum,
+            "max": self.maximum,
+            "samples": self.count,
+        }
+
+
+class BatteryDrainTracker:
+    """Estimate the discharge rate since the battery was last replaced or charged.
+
+    Only the first and latest sample of the current discharge segment are kept, so the
+    estimate sharpens as the segment grows without storing history.
+    """
+
+    def __init__(self) -> None:
+        self._start: tuple[float, float] | None = None
+        self._last: tuple[float, float] | None = None
+
+    def add(self, percentage: float, timestamp: float) -> None:
+        if self._start is None or (
+            self._last is not None and percentage >= self._last[0] + BATTERY_REPLACED_RISE
+        ):
+            self._start = (percentage, timestamp)
+        self._last = (percentage, timestamp)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "start": list(self._start) if self._start is not None else None,
+            "last": list(self._last) if self._last is not None else None,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Continue a discharge segment saved with as_dict, e.g. across restarts."""
+        if data.get("start") and data.get("last"):
+            self._start = tuple(data["start"])
+            self._last = tuple(data["last"])
+
+    @property
+    def drain_rate(self) -> float | None:
+        """Battery percentage lost per day, or None until enough time has passed."""
+        if self._start is None or self._last is None:
+            return None
+        elapsed = self._last[1] - self._start[1]
+        if elapsed < MIN_DRAIN_WINDOW:
+            return None
+        return max(self._start[0] - self._last[0], 0) * SECONDS_PER_DAY / elapsed
+
+    @property
+    def days_remaining(self) -> float | None:
+        rate = self.drain_rate
+        if not rate or self._last is None:
+            return None
+        return self._last[0] / rate
+
+
+class TapoDeviceStatistics:
+    """Incremental battery and signal statistics for a single child device."""
+
+    def __init__(self, alpha: float = DEFAULT_EWMA_ALPHA) -> None:
+        self.battery = RunningStatistic(alpha)
+        self.rssi = RunningStatistic(alpha)
+        self.signal_level = RunningStatistic(alpha)
+        self.battery_drain = BatteryDrainTracker()
+
+    def update(self, device_data: dict[str, Any], timestamp: float) -> None:
+        battery = device_data.get("battery_percentage")
+        if isinstance(battery, (int, float)) and not isinstance(battery, bool):
+            self.battery.add(battery)
+            self.battery_drain.add(battery, timestamp)
+
+        rssi = device_data.get("rssi")
+        if isinstance(rssi, (int, float)) and not isinstance(rssi, bool):
+            self.rssi.add(rssi)
+
+        signal_level = device_data.get("signal_level")
+        if isinstance(signal_level, (int, float)) and not isinstance(signal_level, bool):
+            self.signal_level.add(signal_level)
+
+    def as_sensor_data(self) -> dict[str, Any]:
+        """Derived values merged into the coordinator data, keyed like raw sensors."""
+        result: dict[str, Any] = {}
+
+        if self.battery.count:
+            drain_rate = self.battery_drain.drain_rate
+            days_remaining = self.battery_drain.days_remaining
+            result["battery_drain_rate"] = round(drain_rate, 3) if drain_rate is not None else None
+            result["battery_days_remaining"] = (
+                round(days_remaining, 1) if days_remaining is not None else None
+            )
+        if self.rssi.count:
+            result["rssi_average"] = round(self.rssi.mean, 1)
+        if self.signal_level.count:
+            result["signal_level_average"] = round(self.signal_level.mean, 2)
+
+        return result
+
+    def get_attributes(self, sensor_key: str) -> dict[str, Any]:
+        if sensor_key in ("battery_drain_rate", "battery_days_remaining"):
+            return self.battery.as_dict()
+        if sensor_key == "rssi_average":
+            return self.rssi.as_dict()
+        if sensor_key == "signal_level_average":
+            return self.signal_level.as_dict()
+        return {}
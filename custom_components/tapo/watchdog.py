@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import issue_registry as ir
+
+from .api import TapoAPI
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STALL_TIMEOUT = 60
+RECYCLE_COOLDOWN = 120
+MAX_RECYCLES = 3
+CHECK_INTERVAL = 15
+# A poll runs a probe batch, a full-page batch and possibly one walk of the
+# recovery ladder with its refetches, each call bounded by the API timeout.
+HUNG_POLL_TIMEOUTS = 10
+
+# A button is stale when no new event arrived for STALE_GAP_FACTOR times its usual
+# gap between events, and at least STALE_MIN_AGE seconds. The usual gap is only
+# trusted after MIN_EVENTS_FOR_FRESHNESS new events.
+STALE_GAP_FACTOR = 10
+STALE_MIN_AGE = 6 * 3600
+MIN_EVENTS_FOR_FRESHNESS = 3
+EVENT_GAP_SMOOTHING = 0.2
+
+
+class DeviceProgress:
+    """Real progress of one button's polling, independent of coordinator data."""
+
+    def __init__(self, now: float) -> None:
+        self.started = now
+        self.polls = 0
+        self.failures = 0
+        self.last_success: float | None = None
+        self.last_event_id: Any = None
+        self.last_new_event: float | None = None
+        self.new_events = 0
+        self.event_gap: float | None = None
+
+    def last_progress(self) -> float:
+        return self.last_success if self.last_success is not None else self.started
+
+    def is_stalled(self, now: float) -> bool:
+        return now - self.last_progress() > STALL_TIMEOUT
+
+    def record_event_id(self, event_id: Any, now: float) -> None:
+        if event_id is None or event_id == self.last_event_id:
+            return
+        if self.last_event_id is not None:
+            if self.last_new_event is not None:
+                gap = now - self.last_new_event
+                if self.event_gap is None:
+                    self.event_gap = gap
+                else:
+                    self.event_gap += EVENT_GAP_SMOOTHING * (gap - self.event_gap)
+            self.last_new_event = now
+            self.new_events += 1
+        self.last_event_id = event_id
+
+    def is_stale(self, now: float) -> bool:
+        """Whether the hub keeps answering with the same last event for far too long."""
+        if self.new_events < MIN_EVENTS_FOR_FRESHNESS:
+            return False
+        if self.event_gap is None or self.last_new_event is None:
+            return False
+        return now - self.last_new_event > max(STALE_MIN_AGE, STALE_GAP_FACTOR * self.event_gap)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "seconds_since_success": (
+                round(now - self.last_success, 1) if self.last_success is not None else None
+            ),
+            "seconds_since_new_event": (
+                round(now - self.last_new_event, 1) if self.last_new_event is not None else None
+            ),
+            "usual_event_gap": round(self.event_gap, 1) if self.event_gap is not None else None,
+            "last_event_id": self.last_event_id,
+            "stalled": self.is_stalled(now),
+            "stale": self.is_stale(now),
+        }
+
+
+class TapoPollWatchdog:
+    """Detect stalled button polling and heal it by recycling the hub connection.
+
+    The coordinators keep returning empty data when polls fail, so this tracks
+    whether the hub actually answered for each device. Checks run on their own
+    timer so a hung poll cannot hide a failure:
+
+    - a device without a successful poll for STALL_TIMEOUT seconds is reported
+      as stalled; one failing button is a device problem, so this alone leaves
+      the hub connection alone,
+    - every device stalled, or a poll running for HUNG_POLL_TIMEOUTS request
+      timeouts, means the hub connection is broken; a hung poll is cancelled
+      and the connection recycled, and after MAX_RECYCLES recycles without
+      recovery a repair issue is raised,
+    - every active button answering with the same last event for far longer
+      than its usual gap between presses means the hub serves stale logs; the
+      connection is recycled once, since a quiet house looks the same.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: TapoAPI, entry_id: str) -> None:
+        self.hass = hass
+        self.api = api
+        self.entry_id = entry_id
+        self._progress: dict[str, DeviceProgress] = {}
+        self._last_recycle: float | None = None
+        self._recycles = 0
+        self._issue_raised = False
+        self._stale_recycled = False
+        self._stalled: set[str] = set()
+        self._poll_task: asyncio.Task[Any] | None = None
+        self._poll_started: float | None = None
+
+    @property
+    def _issue_id(self) -> str:
+        return f"poll_stalled_{self.entry_id}"
+
+    def record_poll_started(self) -> None:
+        self._poll_task = asyncio.current_task()
+        self._poll_started = time.monotonic()
+
+    def record_poll_finished(self) -> None:
+        self._poll_task = None
+        self._poll_started = None
+
+    def record_poll(self, device_id: str, probe: dict[str, Any] | None) -> None:
+        now = time.monotonic()
+        progress = self._progress.get(device_id)
+        if progress is None:
+            progress = self._progress[device_id] = DeviceProgress(now)
+
+        progress.polls += 1
+        if probe is None:
+            progress.failures += 1
+            return
+
+        progress.last_success = now
+        new_events = progress.new_events
+        progress.record_event_id(probe.get("start_id"), now)
+        if progress.new_events != new_events:
+            self._stale_recycled = False
+
+    def forget(self, device_id: str) -> None:
+        """Stop tracking a device that is no longer polled."""
+        self._progress.pop(device_id, None)
+        self._stalled.discard(device_id)
+
+    def get_status(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "recycles": self._recycles,
+            "poll_running_for": (
+                round(now - self._poll_started, 1) if self._poll_started is not None else None
+            ),
+            "devices": {
+                device_id: progress.as_dict(now) for device_id, progress in self._progress.items()
+            },
+        }
+
+    def _get_hung_poll_timeout(self) -> float:
+        return max(STALL_TIMEOUT, HUNG_POLL_TIMEOUTS * self.api.timeout)
+
+    def _cancel_hung_poll(self, now: float) -> bool:
+        if self._poll_task is None or self._poll_started is None:
+            return False
+        if now - self._poll_started <= self._get_hung_poll_timeout():
+            return False
+        _LOGGER.warning(
+            "Button poll on hub %s has been running for %ds, cancelling it",
+            self.api.host,
+            now - self._poll_started,
+        )
+        self._poll_task.cancel()
+        self.record_poll_finished()
+        return True
+
+    def _update_device_stalls(self, stalled: list[str]) -> None:
+        for device_id in stalled:
+            if device_id not in self._stalled:
+                _LOGGER.warning(
+                    "No successful poll for %s on hub %s in %ds",
+                    device_id,
+                    self.api.host,
+                    STALL_TIMEOUT,
+                )
+        for device_id in self._stalled.difference(stalled):
+            _LOGGER.info("Polling of %s on hub %s recovered", device_id, self.api.host)
+        self._stalled = set(stalled)
+
+    async def _async_recycle(self) -> None:
+        try:
+            await self.api.async_reconnect()
+        except Exception as err:
+            _LOGGER.warning("Reconnecting to hub %s failed: %s", self.api.host, err)
+
+    async def async_check(self) -> None:
+        now = time.monotonic()
+        hung = self._cancel_hung_poll(now)
+        stalled = [
+            device_id for device_id, progress in self._progress.items() if progress.is_stalled(now)
+        ]
+        self._update_device_stalls(stalled)
+        all_stalled = bool(stalled) and len(stalled) == len(self._progress)
+
+        if not hung and not all_stalled:
+            if self._recycles:
+                _LOGGER.info("Button polling recovered on hub %s", self.api.host)
+            self._recycles = 0
+            if self._issue_raised:
+                ir.async_delete_issue(self.hass, DOMAIN, self._issue_id)
+                self._issue_raised = False
+            await self._async_check_freshness(now)
+            return
+
+        if not hung and self._poll_task is not None:
+            # A poll that is not hung yet may still be recovering the connection.
+            return
+        if self._last_recycle is not None and now - self._last_recycle < RECYCLE_COOLDOWN:
+            return
+
+        devices = ", ".join(stalled or self._progress)
+        if self._recycles >= MAX_RECYCLES and not self._issue_raised:
+            _LOGGER.error(
+                "Button polling on hub %s stalled for %s after %d reconnects",
+                self.api.host,
+                devices,
+                self._recycles,
+            )
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                self._issue_id,
+                is_fixable=False,
+                severity=ir.IssueSeverity.ERROR,
+                translation_key="poll_stalled",
+                translation_placeholders={
+                    "host": self.api.host,
+                    "devices": devices,
+                },
+            )
+            self._issue_raised = True
+
+        self._recycles += 1
+        self._last_recycle = now
+        _LOGGER.warning(
+            "Button polling on hub %s %s, recycling connection (attempt %d)",
+            self.api.host,
+            "hung" if hung else "stalled for every device",
+            self._recycles,
+        )
+        await self._async_recycle()
+
+    async def _async_check_freshness(self, now: float) -> None:
+        # Only buttons with a known press rhythm can tell stale logs from a quiet
+        # house, and one fresh button shows the hub still serves new logs.
+        active = [
+            progress
+            for progress in self._progress.values()
+            if progress.new_events >= MIN_EVENTS_FOR_FRESHNESS
+        ]
+        if self._stale_recycled or not active:
+            return
+        if not all(progress.is_stale(now) for progress in active):
+            return
+
+        self._stale_recycled = True
+        self._last_recycle = now
+        _LOGGER.warning(
+            "Hub %s returned the same last event for every button for too long, "
+            "recycling connection",
+            self.api.host,
+        )
+        await self._async_recycle()
@@ -0,0 +1,23 @@
+"""Replay recorded hub sessions from tests/fixtures against the integration."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.tapo.api import TapoAPI
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+async def async_replay_api(hass: HomeAssistant, cassette: str, speed: float | None = None) -> TapoAPI:
+    """An authenticated API serving the named cassette.
+
+    Without a speed every request gets the next recorded response for the same
+    request at once, so tests replay the session step by step.
+    """
+    api = await hass.async_add_executor_job(
+        TapoAPI.from_cassette, str(FIXTURES / f"{cassette}.jsonl"), speed
+    )
+    assert await api.async_authenticate()
+    return api
@@ -0,0 +1,94 @@
+"""A stand-in for the tapo library's H100 hub handler."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+
+class StandInDevice:
+    def __init__(self, device_id: str) -> None:
+        self.device_id = device_id
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"device_id": self.device_id, "nickname": f"Button {self.device_id}", "battery_percentage": 90}
+
+
+class StandInTriggerLogs:
+    def __init__(self, start_id: int, logs: list[Any]) -> None:
+        self.start_id = start_id
+        self.sum = start_id
+        self.logs = logs
+
+
+class SingleClick:
+    def __init__(self, log_id: int) -> None:
+        self.id = log_id
+        self.timestamp = 1_700_000_000 + log_id
+
+
+class StandInS200:
+    def __init__(self, hub: StandInHub, device_id: str) -> None:
+        self.hub = hub
+        self.device_id = device_id
+
+    async def get_trigger_logs(self, page_size: int, start_id: int) -> StandInTriggerLogs:
+        self.hub.requests.append(self.device_id)
+        delays = self.hub.delays.get(self.device_id)
+        if delays:
+            await asyncio.sleep(delays.pop(0))
+        if error := self.hub.errors.get(self.device_id, self.hub.error):
+            raise Exception(error)
+        latest = self.hub.latest_ids.get(self.device_id, 1)
+        logs = [SingleClick(log_id) for log_id in range(latest, max(latest - page_size, 0), -1)]
+        return StandInTriggerLogs(latest, logs)
+
+
+class StandInHub:
+    """Serves every child device over one session and counts what is asked of it."""
+
+    def __init__(self, device_ids: list[str]) -> None:
+        self.device_ids = device_ids
+        self.requests: list[str] = []
+        self.session_refreshes = 0
+        # Error message raised by every trigger log request, like the library does.
+        self.error: str | None = None
+        self.errors: dict[str, str] = {}
+        self.delays: dict[str, list[float]] = {}
+        self.latest_ids: dict[str, int] = {}
+        self.clear_error_on_refresh = False
+
+    async def get_child_device_list(self) -> list[StandInDevice]:
+        return [StandInDevice(device_id) for device_id in self.device_ids]
+
+    async def s200(self, device_id: str) -> StandInS200:
+        return StandInS200(self, device_id)
+
+    async def refresh_session(self) -> None:
+        self.session_refreshes += 1
+        if self.clear_error_on_refresh:
+            self.error = None
+
+
+class LegacyStandInHub(StandInHub):
+    """A hub handler from library versions without refresh_session."""
+
+    def __getattribute__(self, name: str) -> Any:
+        if name == "refresh_session":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+class StandInClient:
+    """Stands in for tapo.ApiClient; every login returns the same hub."""
+
+    logins = 0
+
+    def __init__(self, hub: StandInHub) -> None:
+        self.hub = hub
+
+    def __call__(self, username: str, password: str) -> StandInClient:
+        return self
+
+    async def h100(self, host: str) -> StandInHub:
+        StandInClient.logins += 1
+        return self.hub
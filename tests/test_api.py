@@ -0,0 +1,126 @@
+"""Tests for TapoAPI against a stand-in hub."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.tapo.api import (
+    RECOVERY_HANDLER,
+    RECOVERY_LOGIN,
+    RECOVERY_RETRY,
+    RECOVERY_SESSION,
+    TapoAPI,
+)
+
+from .stand_in_hub import LegacyStandInHub, StandInClient, StandInHub
+
+DEVICE_IDS = ["button_1", "button_2", "button_3"]
+
+
+@pytest.fixture
+def hub():
+    return StandInHub(DEVICE_IDS)
+
+
+@pytest.fixture
+async def api(hub):
+    client = StandInClient(hub)
+    StandInClient.logins = 0
+    with patch("custom_components.tapo.api.ApiClient", client):
+        api = TapoAPI("user", "password", "192.0.2.1", timeout=2, hedge_delay=0.05)
+        assert await api.async_authenticate()
+        yield api
+        await api.async_close()
+
+
+async def test_batch_polls_every_device(api, hub):
+    hub.latest_ids = {"button_1": 5, "button_2": 7, "button_3": 1}
+
+    results = await api.async_get_trigger_logs_batch(DEVICE_IDS, page_size=1)
+
+    assert {device_id: page["start_id"] for device_id, page in results.items()} == hub.latest_ids
+    assert sorted(hub.requests) == DEVICE_IDS
+
+
+async def test_batch_requests_are_hedged(api, hub):
+    hub.delays = {"button_1": [0.5], "button_2": [0.5]}
+
+    results = await api.async_get_trigger_logs_batch(DEVICE_IDS, page_size=1)
+
+    assert all(results.values())
+    assert api.get_hedged_request_count() == 2
+    assert hub.requests.count("button_1") == 2
+    assert hub.requests.count("button_3") == 1
+
+
+async def test_hub_outage_recovers_once(api, hub):
+    hub.error = "Tapo(SessionTimeout)"
+    logins = StandInClient.logins
+
+    results = await api.async_get_trigger_logs_batch(DEVICE_IDS, page_size=1)
+
+    assert results == dict.fromkeys(DEVICE_IDS)
+    assert hub.session_refreshes == 1
+    assert StandInClient.logins == logins + 1
+    recovery = api.get_recovery_counts()
+    assert recovery[RECOVERY_SESSION] == 1
+    assert recovery[RECOVERY_LOGIN] == 1
+
+
+async def test_session_refresh_recovers_batch(api, hub):
+    hub.error = "Tapo(SessionTimeout)"
+    hub.clear_error_on_refresh = True
+    logins = StandInClient.logins
+
+    results = await api.async_get_trigger_logs_batch(DEVICE_IDS, page_size=1)
+
+    assert all(results.values())
+    assert hub.session_refreshes == 1
+    assert StandInClient.logins == logins
+
+
+@pytest.mark.parametrize("hub", [LegacyStandInHub(DEVICE_IDS)])
+async def test_skipped_recovery_steps_are_not_counted(api, hub):
+    hub.error = "Http(reqwest::Error connection reset)"
+
+    await api.async_get_trigger_logs_batch(DEVICE_IDS, page_size=1)
+
+    assert api.get_recovery_counts() == {
+        RECOVERY_RETRY: 1,
+        RECOVERY_HANDLER: 1,
+        RECOVERY_SESSION: 0,
+        RECOVERY_LOGIN: 1,
+    }
+
+
+async def test_single_failure_retries_only_that_device(api, hub):
+    hub.errors = {"button_2": "Tapo(DeviceNotFound)"}
+
+    results = await api.async_get_trigger_logs_batch(DEVICE_IDS, page_size=1)
+
+    assert results["button_1"] and results["button_3"]
+    assert results["button_2"] is None
+    assert hub.requests.count("button_2") == 2
+    assert hub.session_refreshes == 0
+
+
+async def test_result_fetched_before_invalidation_is_not_cached(api, hub):
+    release = asyncio.Event()
+    list_calls = 0
+    original = hub.get_child_device_list
+
+    async def slow_child_device_list():
+        nonlocal list_calls
+        list_calls += 1
+        await release.wait()
+        return await original()
+
+    hub.get_child_device_list = slow_child_device_list
+    request = asyncio.ensure_future(api.async_get_all_child_devices(max_age=60))
+    await asyncio.sleep(0)
+    api._invalidate_coalesced()
+    release.set()
+    await request
+
+    await api.async_get_all_child_devices(max_age=60)
+    assert list_calls == 2
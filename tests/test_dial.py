@@ -0,0 +1,47 @@
+"""Tests for dial bindings and their command rate limiting."""
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.tapo.dial import TapoDialManager
+from custom_components.tapo.events import TapoEventStream
+
+
+class StandInAPI:
+    def __init__(self):
+        self.events = TapoEventStream()
+
+    def subscribe(self, device_id):
+        return self.events.subscribe(device_id)
+
+
+async def test_missing_device_binding_is_kept(hass, hass_storage):
+    key = "tapo.dial_bindings.entry"
+    gone = {"entity_id": "light.hall", "degrees_per_step": 30, "step": 10, "min_interval": 0.15}
+    hass_storage[key] = {"version": 1, "key": key, "data": {"gone": gone}}
+    manager = TapoDialManager(hass, StandInAPI(), "entry", ["dial"])
+
+    await manager.async_load()
+    await manager.async_bind("dial", {"entity_id": "light.desk"})
+    manager.async_stop()
+
+    assert manager.get_mapper("gone") is None
+    assert hass_storage[key]["data"]["gone"] == gone
+    assert hass_storage[key]["data"]["dial"]["entity_id"] == "light.desk"
+
+
+async def test_fast_rotation_is_coalesced(hass):
+    calls = async_mock_service(hass, "light", "turn_on")
+    api = StandInAPI()
+    manager = TapoDialManager(hass, api, "entry", ["dial"])
+    await manager.async_bind("dial", {"entity_id": "light.desk", "min_interval": 60})
+
+    for event_id in range(5):
+        api.events.publish(
+            "dial", {"event_id": event_id, "rotation_degrees": 30, "direction": "right"}
+        )
+    await hass.async_block_till_done()
+
+    assert manager.get_stats() == {
+        "dial": {"entity_id": "light.desk", "events_received": 5, "commands_sent": 1}
+    }
+    assert len(calls) == 1
+    manager.async_stop()
@@ -0,0 +1,62 @@
+"""Tests for the button event stream and its overflow policies."""
+from custom_components.tapo.events import (
+    OVERFLOW_CLOSE,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_DROP_OLDEST,
+    TapoEventStream,
+)
+
+
+def publish(stream, count, device_id="button_1"):
+    for event_id in range(1, count + 1):
+        stream.publish(device_id, {"event_id": event_id})
+
+
+async def collect(subscription, count):
+    return [(await subscription.__anext__())["event_id"] for _ in range(count)]
+
+
+async def test_drop_oldest_keeps_latest_events():
+    stream = TapoEventStream()
+    subscription = stream.subscribe("button_1", maxsize=3, overflow=OVERFLOW_DROP_OLDEST)
+
+    publish(stream, 5)
+
+    assert await collect(subscription, 3) == [3, 4, 5]
+    assert subscription.dropped == 2
+    assert not subscription.closed
+
+
+async def test_drop_newest_keeps_earliest_events():
+    stream = TapoEventStream()
+    subscription = stream.subscribe("button_1", maxsize=3, overflow=OVERFLOW_DROP_NEWEST)
+
+    publish(stream, 5)
+
+    assert await collect(subscription, 3) == [1, 2, 3]
+    assert subscription.dropped == 2
+
+
+async def test_close_ends_a_subscriber_that_fell_behind():
+    stream = TapoEventStream()
+    slow = stream.subscribe("button_1", maxsize=3, overflow=OVERFLOW_CLOSE)
+    everything = stream.subscribe(maxsize=10)
+
+    publish(stream, 5)
+
+    assert slow.closed
+    assert [event["event_id"] async for event in slow] == [1, 2, 3]
+    # Other subscribers keep receiving events.
+    assert await collect(everything, 5) == [1, 2, 3, 4, 5]
+
+
+async def test_subscription_filters_by_device():
+    stream = TapoEventStream()
+    subscription = stream.subscribe("button_2")
+
+    publish(stream, 2, "button_1")
+    publish(stream, 1, "button_2")
+
+    assert await collect(subscription, 1) == [1]
+    subscription.close()
+    assert [event async for event in subscription] == []
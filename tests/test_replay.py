@@ -0,0 +1,48 @@
+"""Regression tests that drive the coordinators from recorded hub sessions."""
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.tapo.button import TapoButtonCoordinator, TapoEventPoller
+from custom_components.tapo.sensor import TapoCoordinator
+
+from .replay import async_replay_api
+
+DEVICE_ID = "802E1A5C000000000000000000000000000000B1"
+
+
+async def test_recorded_session_fires_new_events(hass):
+    api = await async_replay_api(hass, "s200_session")
+    events = async_capture_events(hass, "tapo_button_pressed")
+    coordinator = TapoButtonCoordinator(hass, api, DEVICE_ID)
+    poller = TapoEventPoller(hass, api, 1.0)
+    poller.add_coordinator(coordinator)
+
+    # The first refresh only learns the newest event, it does not fire old ones.
+    await coordinator.async_refresh()
+    assert coordinator.data["last_event"]["id"] == 5
+    # The hub's log did not change, so only the probe is fetched.
+    requests = api.replay_hub.requests
+    await poller.async_poll()
+    assert api.replay_hub.requests == requests + 1
+    # A double click and a rotation arrived since the last poll.
+    await poller.async_poll()
+    await hass.async_block_till_done()
+
+    assert [(event.data["event_id"], event.data["click_type"]) for event in events] == [
+        (6, "rotate_left"),
+        (7, "double_click"),
+    ]
+    assert events[0].data["rotation_degrees"] == 30
+    assert coordinator.data["snapshot"].native_value == "Double Click"
+    await api.async_close()
+
+
+async def test_recorded_session_sensor_data(hass):
+    api = await async_replay_api(hass, "s200_session")
+    coordinator = TapoCoordinator(hass, api, DEVICE_ID)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.data["nickname"] == "Hall button"
+    assert coordinator.data["battery_percentage"] == 87
+    assert coordinator.data["rssi"] == -58
+    await api.async_close()
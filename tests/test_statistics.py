@@ -0,0 +1,35 @@
+"""Tests for the incremental device statistics."""
+from custom_components.tapo.statistics import BatteryDrainTracker
+
+DAY = 86400
+
+
+def test_drain_rate_ignores_small_rises():
+    tracker = BatteryDrainTracker()
+    for day in range(9):
+        blip = 1 if day == 4 else 0
+        tracker.add(100 - 0.25 * day + blip, day * DAY)
+
+    assert tracker.drain_rate == 0.25
+
+
+def test_drain_rate_resets_on_battery_swap():
+    tracker = BatteryDrainTracker()
+    tracker.add(20, 0)
+    tracker.add(19, DAY)
+    tracker.add(100, 2 * DAY)
+    tracker.add(99, 4 * DAY)
+
+    assert tracker.drain_rate == 0.5
+
+
+def test_drain_segment_survives_restore():
+    tracker = BatteryDrainTracker()
+    tracker.add(100, 0)
+    tracker.add(99, 4 * DAY)
+
+    restored = BatteryDrainTracker()
+    restored.restore(tracker.as_dict())
+    restored.add(98, 8 * DAY)
+
+    assert restored.drain_rate == 0.25
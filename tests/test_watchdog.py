@@ -0,0 +1,128 @@
+"""Tests for the button polling watchdog."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.tapo.watchdog import (
+    HUNG_POLL_TIMEOUTS,
+    RECYCLE_COOLDOWN,
+    STALE_MIN_AGE,
+    STALL_TIMEOUT,
+    TapoPollWatchdog,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("custom_components.tapo.watchdog.time", SimpleNamespace(monotonic=clock.monotonic)):
+        yield clock
+
+
+@pytest.fixture
+def watchdog(hass, clock):
+    api = SimpleNamespace(host="192.0.2.1", timeout=30, async_reconnect=AsyncMock())
+    return TapoPollWatchdog(hass, api, "entry")
+
+
+def press(watchdog, clock, device_id, event_id, gap):
+    clock.now += gap
+    watchdog.record_poll(device_id, {"start_id": event_id})
+
+
+async def test_stale_logs_recycle_once(watchdog, clock):
+    for event_id in range(1, 6):
+        press(watchdog, clock, "button_1", event_id, 600)
+
+    # Polls keep succeeding with the same last event.
+    for _ in range(3):
+        press(watchdog, clock, "button_1", 5, STALE_MIN_AGE / 2)
+        await watchdog.async_check()
+
+    assert watchdog.get_status()["devices"]["button_1"]["stale"]
+    assert watchdog.api.async_reconnect.await_count == 1
+
+
+async def test_one_fresh_button_is_not_stale(watchdog, clock):
+    for event_id in range(1, 6):
+        press(watchdog, clock, "button_1", event_id, 600)
+        watchdog.record_poll("button_2", {"start_id": event_id})
+
+    clock.now += STALE_MIN_AGE * 2
+    watchdog.record_poll("button_1", {"start_id": 5})
+    watchdog.record_poll("button_2", {"start_id": 6})
+    await watchdog.async_check()
+
+    assert watchdog.api.async_reconnect.await_count == 0
+
+
+async def test_one_failing_button_does_not_recycle(watchdog, clock):
+    for _ in range(10):
+        clock.now += STALL_TIMEOUT
+        watchdog.record_poll("button_1", None)
+        watchdog.record_poll("button_2", {"start_id": 1})
+        await watchdog.async_check()
+
+    devices = watchdog.get_status()["devices"]
+    assert devices["button_1"]["stalled"]
+    assert not devices["button_2"]["stalled"]
+    assert watchdog.api.async_reconnect.await_count == 0
+
+
+async def test_every_button_failing_recycles(watchdog, clock):
+    watchdog.record_poll("button_1", {"start_id": 1})
+    watchdog.record_poll("button_2", {"start_id": 1})
+
+    for _ in range(3):
+        clock.now += RECYCLE_COOLDOWN
+        watchdog.record_poll("button_1", None)
+        watchdog.record_poll("button_2", None)
+        await watchdog.async_check()
+
+    assert watchdog.api.async_reconnect.await_count == 3
+
+
+async def start_poll(watchdog):
+    async def poll():
+        watchdog.record_poll_started()
+        await asyncio.Event().wait()
+
+    task = asyncio.create_task(poll())
+    await asyncio.sleep(0)
+    return task
+
+
+async def test_slow_poll_is_not_cancelled(watchdog, clock):
+    watchdog.record_poll("button_1", {"start_id": 1})
+    task = await start_poll(watchdog)
+
+    # Slower than the stall timeout, but within the request timeouts of one poll.
+    clock.now += 3 * watchdog.api.timeout
+    await watchdog.async_check()
+
+    assert not task.done()
+    assert watchdog.api.async_reconnect.await_count == 0
+    task.cancel()
+
+
+async def test_hung_poll_is_cancelled(watchdog, clock):
+    watchdog.record_poll("button_1", {"start_id": 1})
+    task = await start_poll(watchdog)
+
+    clock.now += HUNG_POLL_TIMEOUTS * watchdog.api.timeout + 1
+    await watchdog.async_check()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert watchdog.api.async_reconnect.await_count == 1
+    assert watchdog.get_status()["poll_running_for"] is None